@@ -1,6 +1,6 @@
 const Complaint = require('../models/Complaint');
 const { validateDisasterComplaint } = require('../utils/geminiValidator');
-const { runSpamClassifier, runDisasterClassifier } = require('../utils/mlValidators');
+const { runSpamClassifier, runDisasterClassifier, submitClassifierFeedback } = require('../utils/mlValidators');
 const { notifyComplaintVerified, notifyComplaintRejected, notifyComplaintInProgress, notifyComplaintResolved } = require('../utils/notificationHelper');
 
 // @desc    Create a new complaint
@@ -628,6 +628,9 @@ exports.manualVerifyComplaint = async (req, res) => {
       });
     }
 
+    // Feed the admin's decision back to the classifier (runs in the background)
+    submitClassifierFeedback(complaint.text, verified);
+
     // Send notification to user
     if (verified) {
       await notifyComplaintVerified(complaint.userId, complaint._id, complaint.type);
@@ -739,6 +742,9 @@ exports.overrideAIRejection = async (req, res) => {
       { new: true }
     );
 
+    // The admin corrected the AI: feed the decision back to the classifier (runs in the background)
+    submitClassifierFeedback(updatedComplaint.text, verified);
+
     res.status(200).json({
       success: true,
       data: updatedComplaint,
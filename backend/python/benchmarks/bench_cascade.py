@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: linear-first cascade vs the full RF+SVM ensemble
+For several threshold bands, reports the share of rows each stage decides,
+accuracy against the labels, agreement with the ensemble, and throughput.
+A linear model is fitted on the dataset first if the saved models lack one.
+"""
+
+import argparse
+
+import numpy as np
+
+from bench_utils import synthetic_corpus, load_classifier, timed
+
+LABELS = {1: 'verified', 0: 'not_verified'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--bands', type=float, nargs='+', default=[0.05, 0.1, 0.2, 0.3],
+                        help='low thresholds; each band is (low, 1 - low)')
+    args = parser.parse_args()
+
+    classifier = load_classifier()
+    if classifier.linear_model is None:
+        print("Saved models have no linear model, fitting one on the dataset...")
+        classifier.train_linear_model()
+
+    corpus = synthetic_corpus(args.rows, seed=7, with_labels=True)
+    X = classifier.build_features([text for text, _ in corpus])
+    y = np.array([LABELS[label] for _, label in corpus])
+
+    (_, _, _), ensemble_time = timed(classifier.predict_features, X)
+
+    print(f"\n=== Cascade vs ensemble on {args.rows} synthetic rows ===")
+    print(f"full ensemble: {args.rows / ensemble_time:.0f} rows/s")
+    print(f"{'band':>12} {'linear %':>9} {'cascade acc':>12} {'ensemble acc':>13} "
+          f"{'agreement':>10} {'rows/s':>8} {'speedup':>8}")
+
+    classifier.cascade = True
+    for low in args.bands:
+        classifier.cascade_thresholds = (low, 1 - low)
+        evaluation = classifier.evaluate_cascade(X, y)
+        _, cascade_time = timed(classifier.predict_features, X)
+        print(f"{f'({low:.2f}, {1 - low:.2f})':>12} {evaluation['linear_fraction']:>9.1%} "
+              f"{evaluation['cascade_accuracy']:>12.3f} {evaluation['ensemble_accuracy']:>13.3f} "
+              f"{evaluation['agreement_with_ensemble']:>10.3f} {args.rows / cascade_time:>8.0f} "
+              f"{ensemble_time / cascade_time:>7.1f}x")
+
+    print("\nHalf of the synthetic rows have a fragment of another complaint appended. The ensemble is")
+    print("less accurate than the linear model on those, so low agreement means ensemble errors, not")
+    print("cascade errors (compare the accuracy columns). The held-out comparison is printed by")
+    print("train_models()/train_linear_model().")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sklearn RandomForestClassifier vs the flattened CompactForest
+Checks that both give identical probabilities on a synthetic corpus, then
+compares predict_proba time per batch size, pickled size, unpickling time
+and the memory the unpickled model holds
+"""
+
+import argparse
+import pickle
+import statistics
+import tracemalloc
+
+import numpy as np
+
+from bench_utils import synthetic_corpus, load_classifier, timed
+from compact_forest import CompactForest
+
+
+def median_time(func, repeat):
+    return statistics.median(timed(func)[1] for _ in range(repeat))
+
+
+def unpickled_memory(data):
+    """Bytes allocated (and still held) by unpickling data"""
+    tracemalloc.start()
+    model = pickle.loads(data)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del model
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    classifier = load_classifier()
+    forest = classifier.rf_model
+    if isinstance(forest, CompactForest):
+        print("The loaded models already use a compact forest; load sklearn models to compare")
+        return
+    compact = CompactForest.from_forest(forest)
+
+    X = classifier.build_features(synthetic_corpus(args.rows))
+    expected, actual = forest.predict_proba(X), compact.predict_proba(X)
+    print(f"=== Parity over {args.rows} complaints ===")
+    print(f"identical probabilities: {np.array_equal(expected, actual)} "
+          f"(max difference {np.abs(expected - actual).max():.3g})")
+    print(f"{compact.n_estimators} trees, {len(compact.feature)} nodes, depth {compact.depth}, "
+          f"{len(compact.columns)} of {compact.n_features_in_} features used")
+
+    print("\n=== predict_proba() time ===")
+    print(f"{'rows':>6} {'sklearn ms':>11} {'compact ms':>11} {'speedup':>8}")
+    for size in args.sizes:
+        batch = X[:size]
+        sklearn_time = median_time(lambda: forest.predict_proba(batch), args.repeat)
+        compact_time = median_time(lambda: compact.predict_proba(batch), args.repeat)
+        print(f"{size:>6} {sklearn_time * 1000:>11.3f} {compact_time * 1000:>11.3f} {sklearn_time / compact_time:>7.1f}x")
+
+    print("\n=== Storage and loading ===")
+    print(f"{'model':>8} {'pickle KB':>10} {'unpickle ms':>12} {'memory KB':>10}")
+    for name, model in (('sklearn', forest), ('compact', compact)):
+        data = pickle.dumps(model, protocol=5)
+        load_time = median_time(lambda: pickle.loads(data), args.repeat)
+        print(f"{name:>8} {len(data) / 1024:>10.0f} {load_time * 1000:>12.2f} {unpickled_memory(data) / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
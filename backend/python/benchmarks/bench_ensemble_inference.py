@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request latency of the ensemble path
+Compares the previous implementation, which called predict() on both models
+after predict_proba() to fill the details, with the current single
+predict_proba() per model. Also counts rows where SVC.predict() disagrees
+with the argmax of its Platt-scaled probabilities.
+"""
+
+import argparse
+
+import numpy as np
+
+from bench_utils import synthetic_corpus, load_classifier, timed
+
+
+def previous_ensemble(classifier, X):
+    """The ensemble branch as it was before: probabilities, then predict() again per model"""
+    X_svm = classifier.svm_input(X)
+    rf_prob = classifier.rf_model.predict_proba(X)
+    svm_prob = classifier.svm_model.predict_proba(X_svm)
+    avg_prob = (rf_prob + svm_prob) / 2
+    classes = classifier.rf_model.classes_
+    return classes[np.argmax(avg_prob, axis=1)], np.max(avg_prob, axis=1), {
+        'rf_prediction': classifier.rf_model.predict(X),
+        'svm_prediction': classifier.svm_model.predict(X_svm),
+        'rf_confidence': np.max(rf_prob, axis=1),
+        'svm_confidence': np.max(svm_prob, axis=1)
+    }
+
+
+def current_ensemble(classifier, X):
+    return classifier._predict_ensemble(X, True)
+
+
+def per_request_ms(func, classifier, rows):
+    """Median latency of scoring one pre-built feature row at a time"""
+    times = [timed(func, classifier, row)[1] for row in rows]
+    return float(np.median(times)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--batch', type=int, default=10000)
+    args = parser.parse_args()
+
+    classifier = load_classifier()
+
+    texts = synthetic_corpus(max(args.requests, args.batch))
+    X = classifier.build_features(texts)
+    rows = [X[i] for i in range(args.requests)]
+
+    # Warm up both paths so lazy imports and allocations are not timed
+    previous_ensemble(classifier, rows[0])
+    current_ensemble(classifier, rows[0])
+
+    previous_ms = per_request_ms(previous_ensemble, classifier, rows)
+    current_ms = per_request_ms(current_ensemble, classifier, rows)
+
+    X_batch = X[:args.batch]
+    previous, previous_time = timed(previous_ensemble, classifier, X_batch)
+    current, current_time = timed(current_ensemble, classifier, X_batch)
+
+    assert list(previous[0]) == list(current[0]), "ensemble prediction mismatch"
+    assert np.allclose(previous[1], current[1]), "ensemble confidence mismatch"
+    svm_disagreements = int(np.sum(previous[2]['svm_prediction'] != current[2]['svm_prediction']))
+
+    print("=== Ensemble inference: predict_proba + predict vs predict_proba only ===")
+    print(f"{'':>10} {'ms/request':>11} {f'{args.batch} rows':>12}")
+    print(f"{'previous':>10} {previous_ms:>11.2f} {previous_time:>11.2f}s")
+    print(f"{'current':>10} {current_ms:>11.2f} {current_time:>11.2f}s")
+    print(f"speedup: {previous_ms / current_ms:.2f}x per request, {previous_time / current_time:.2f}x batched")
+    print(f"\nEnsemble predictions and confidences are unchanged. SVC.predict() disagreed with "
+          f"its probabilities on {svm_disagreements} of {args.batch} rows")
+
+
+if __name__ == "__main__":
+    main()
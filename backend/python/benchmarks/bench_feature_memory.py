@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak RSS of training feature assembly, dense vs sparse
+Each mode runs in a fresh subprocess so ru_maxrss only reflects that mode.
+'dense' reproduces the old X_text.toarray() + np.hstack assembly,
+'sparse' uses DisasterClassifier.combine_features (CSR end to end).
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+
+import numpy as np
+
+from bench_utils import synthetic_corpus, timed
+
+
+def assemble(mode, rows):
+    """Preprocess, vectorize and assemble the training matrix; return stats"""
+    from disaster_classifier import DisasterClassifier
+
+    classifier = DisasterClassifier()
+    texts = synthetic_corpus(rows)
+    processed = [classifier.preprocess_text(text) for text in texts]
+
+    vectorizer = classifier.create_vectorizer()
+    X_text = vectorizer.fit_transform(processed)
+
+    if mode == 'dense':
+        def build():
+            additional = np.array([list(classifier.extract_features(t).values()) for t in texts])
+            return np.hstack([X_text.toarray(), additional])
+        X, elapsed = timed(build)
+        matrix_bytes = X.nbytes
+    else:
+        X, elapsed = timed(classifier.combine_features, X_text, texts)
+        matrix_bytes = X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+
+    return {
+        'mode': mode,
+        'rows': rows,
+        'shape': list(X.shape),
+        'matrix_mb': matrix_bytes / 2**20,
+        'assembly_s': elapsed,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def run_child(mode, rows):
+    """Run one mode in a subprocess and parse its JSON line"""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode, '--rows', str(rows)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        # Typically the dense mode being killed for running out of memory
+        return {'mode': mode, 'rows': rows, 'error': f"exit code {result.returncode}"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--modes', nargs='+', default=['dense', 'sparse'], choices=['dense', 'sparse'])
+    parser.add_argument('--child', choices=['dense', 'sparse'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(assemble(args.child, args.rows[0])))
+        return
+
+    print("=== Training feature assembly: peak RSS ===")
+    print(f"{'mode':>7} {'rows':>9} {'matrix MB':>10} {'peak RSS MB':>12} {'assembly s':>11}")
+    for rows in args.rows:
+        for mode in args.modes:
+            stats = run_child(mode, rows)
+            if 'error' in stats:
+                print(f"{mode:>7} {rows:>9} {'failed (' + stats['error'] + ')':>35}")
+                continue
+            print(f"{mode:>7} {rows:>9} {stats['matrix_mb']:>10.1f} "
+                  f"{stats['peak_rss_mb']:>12.1f} {stats['assembly_s']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: float64 vs float32 features and models
+Trains the models once per dtype on the dataset and reports the feature matrix
+size, peak traced memory of training and of batch scoring, scoring time, the
+held-out accuracies, and how far the float32 predictions are from the float64
+ones on a synthetic corpus (also with a compact forest and compressed SVM)
+"""
+
+import argparse
+import io
+import statistics
+import tracemalloc
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from bench_utils import synthetic_corpus, timed
+from disaster_classifier import DisasterClassifier, FEATURE_DTYPES
+
+
+def matrix_bytes(X):
+    return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+
+
+def traced_peak(func):
+    """(result, peak bytes traced by tracemalloc while func ran)"""
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak
+
+
+def median_time(func, repeat):
+    return statistics.median(timed(func)[1] for _ in range(repeat))
+
+
+def train(dtype, args):
+    classifier = DisasterClassifier(dtype=dtype, cache_size=0)
+    with redirect_stdout(io.StringIO()):
+        _, peak = traced_peak(lambda: classifier.train_models(n_jobs=args.n_jobs))
+    return classifier, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000, help='synthetic complaints scored per batch')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--n-jobs', type=int, default=1, help='training cores (1 keeps all allocations traced)')
+    args = parser.parse_args()
+
+    texts = synthetic_corpus(args.rows)
+    # The first run also imports sklearn's estimator modules; keep that out of both peaks
+    print("Warm-up training run...")
+    train('float64', args)
+
+    results = {}
+    for dtype in FEATURE_DTYPES:
+        print(f"Training {dtype} models...")
+        classifier, training_peak = train(dtype, args)
+        df = classifier.load_dataset()
+        X_train = classifier.build_features(list(df['text']))
+        X = classifier.build_features(texts)
+        (predictions, confidences, _), scoring_peak = traced_peak(lambda: classifier.predict_batch(texts))
+        results[dtype] = {
+            'classifier': classifier,
+            'predictions': predictions,
+            'confidences': confidences,
+            'train_matrix': matrix_bytes(X_train),
+            'batch_matrix': matrix_bytes(X),
+            'training_peak': training_peak,
+            'scoring_peak': scoring_peak,
+            'features_time': median_time(lambda: classifier.build_features(texts), args.repeat),
+            'scoring_time': median_time(lambda: classifier.predict_features(X), args.repeat)
+        }
+
+    print(f"\n=== Memory and time ({args.rows} complaints per batch) ===")
+    print(f"{'dtype':>8} {'train X MB':>11} {'batch X MB':>11} {'train peak MB':>14} "
+          f"{'score peak MB':>14} {'features s':>11} {'scoring s':>10}")
+    for dtype, result in results.items():
+        print(f"{dtype:>8} {result['train_matrix'] / 2 ** 20:>11.2f} {result['batch_matrix'] / 2 ** 20:>11.2f} "
+              f"{result['training_peak'] / 2 ** 20:>14.1f} {result['scoring_peak'] / 2 ** 20:>14.1f} "
+              f"{result['features_time']:>11.3f} {result['scoring_time']:>10.3f}")
+
+    print("\n=== Held-out accuracy ===")
+    print(f"{'dtype':>8} {'RF':>7} {'SVM':>7} {'linear':>7} {'ensemble':>9}")
+    for dtype, result in results.items():
+        metrics = result['classifier'].training_metrics
+        print(f"{dtype:>8} {metrics['rf_accuracy']:>7.3f} {metrics['svm_accuracy']:>7.3f} "
+              f"{metrics['linear_accuracy']:>7.3f} {metrics['ensemble_accuracy']:>9.3f}")
+
+    full, reduced = results['float64'], results['float32']
+    print(f"\n=== float32 vs float64 over {args.rows} synthetic complaints ===")
+    print(f"ensemble agreement: {np.mean(full['predictions'] == reduced['predictions']):.2%}, "
+          f"max confidence difference {np.abs(full['confidences'] - reduced['confidences']).max():.3g}")
+
+    print("\n=== With a compact forest and compressed SVM ===")
+    print(f"{'dtype':>8} {'forest KB':>10} {'SVM KB':>7} {'agreement':>10}")
+    compiled = {}
+    for dtype, result in results.items():
+        classifier = result['classifier']
+        with redirect_stdout(io.StringIO()):
+            classifier.train_compressed_svm()
+        classifier.compile_forest()
+        classifier.svm_variant = 'compressed'
+        compiled[dtype] = classifier.predict_batch(texts)[0]
+        agreement = np.mean(compiled[dtype] == compiled['float64'])
+        print(f"{dtype:>8} {classifier.rf_model.nbytes / 1024:>10.0f} {classifier.svm_compressed.nbytes / 1024:>7.0f} "
+              f"{agreement:>10.2%}")
+    print("(agreement with the float64 compact/compressed ensemble)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: import time and cold start of the inference path
+Uses `python -X importtime` for the module import and a fresh process for
+import + DisasterClassifier() + load_models() + first predict(), and lists
+which heavy training-only packages the inference path still loads
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from bench_utils import PYTHON_DIR, MODEL_DIR
+
+# Packages only the training path should need
+TRAINING_ONLY_MODULES = ['pandas', 'sklearn.model_selection', 'sklearn.metrics', 'sklearn.pipeline']
+
+COLD_START = '''
+import json, sys, time
+start = time.perf_counter()
+from disaster_classifier import DisasterClassifier
+imported = time.perf_counter()
+classifier = DisasterClassifier()
+created = time.perf_counter()
+classifier.load_models({model_dir!r})
+loaded = time.perf_counter()
+classifier.predict("Severe flooding in downtown area, need help")
+predicted = time.perf_counter()
+print(json.dumps({{
+    'import': imported - start,
+    'create': created - imported,
+    'load_models': loaded - created,
+    'first_predict': predicted - loaded,
+    'total': predicted - start,
+    'training_modules': [m for m in {modules!r} if m in sys.modules]
+}}))
+'''
+
+
+def import_time():
+    """Return (cumulative us for disaster_classifier, {module: cumulative us}) from -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import disaster_classifier'],
+                            capture_output=True, text=True, cwd=PYTHON_DIR, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+    return modules['disaster_classifier'], modules
+
+
+SKLEARN_FLOOR = '''
+import json, time
+start = time.perf_counter()
+import sklearn.ensemble, sklearn.svm, sklearn.feature_extraction.text
+print(json.dumps({'total': time.perf_counter() - start}))
+'''
+
+
+def run_json(code):
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=PYTHON_DIR, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def cold_start():
+    return run_json(COLD_START.format(model_dir=MODEL_DIR, modules=TRAINING_ONLY_MODULES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [import_time() for _ in range(args.repeat)]
+    print(f"=== import disaster_classifier (median of {args.repeat}, -X importtime) ===")
+    print(f"cumulative: {statistics.median(total for total, _ in runs) / 1000:.1f} ms")
+
+    _, modules = runs[-1]
+    top_level = {name: us for name, us in modules.items() if '.' not in name and name != 'disaster_classifier'}
+    print("\nHeaviest top-level imports (last run):")
+    for name, us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<24} {us / 1000:>8.1f} ms")
+
+    starts = [cold_start() for _ in range(args.repeat)]
+    print(f"\n=== Cold start in a fresh process (median of {args.repeat}) ===")
+    for stage in ('import', 'create', 'load_models', 'first_predict', 'total'):
+        print(f"  {stage:<14} {statistics.median(run[stage] for run in starts) * 1000:>8.1f} ms")
+
+    # Unpickling the models imports the estimators' modules, which cannot be avoided
+    floor = statistics.median(run_json(SKLEARN_FLOOR)['total'] for _ in range(args.repeat))
+    print(f"  {'sklearn floor':<14} {floor * 1000:>8.1f} ms  (importing the unpickled estimators alone)")
+
+    loaded = starts[-1]['training_modules']
+    print(f"\nTraining-only modules loaded by inference: {', '.join(loaded) if loaded else 'none'}")
+    if loaded:
+        print("(check whether the sklearn floor import alone already loads them)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MicroBatcher latency/throughput trade-off
+Client threads each send one complaint at a time and wait for its answer.
+For every (max batch, max wait) setting, reports requests per second,
+p50/p99 latency, the mean batch size and the batch-size histogram.
+max batch 1 is the unbatched baseline.
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from bench_utils import synthetic_corpus, load_classifier
+from micro_batcher import MicroBatcher
+
+
+def run_clients(batcher, texts, clients):
+    """Split texts across closed-loop client threads; returns (latencies, elapsed seconds)"""
+    latencies = [[] for _ in range(clients)]
+
+    def client(index):
+        for text in texts[index::clients]:
+            start = time.perf_counter()
+            batcher.submit(text).result()
+            latencies[index].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return np.concatenate([np.array(values) for values in latencies]), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--max-batch', type=int, nargs='+', default=[1, 8, 32, 64])
+    parser.add_argument('--max-wait-ms', type=float, nargs='+', default=[2.0, 5.0])
+    args = parser.parse_args()
+
+    classifier = load_classifier()
+    texts = synthetic_corpus(args.requests)
+
+    print(f"=== MicroBatcher: {args.requests} requests from {args.clients} clients ===")
+    print(f"{'batch':>6} {'wait ms':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'mean size':>10}  histogram")
+
+    for max_batch in args.max_batch:
+        for max_wait_ms in (args.max_wait_ms if max_batch > 1 else [0.0]):
+            batcher = MicroBatcher(classifier.predict_texts, max_batch, max_wait_ms)
+            latencies, elapsed = run_clients(batcher, texts, args.clients)
+            batcher.close()
+
+            stats = batcher.stats()
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            histogram = ' '.join(f"{bucket}:{count}" for bucket, count in stats['batch_size_histogram'].items())
+            print(f"{max_batch:>6} {max_wait_ms:>8.1f} {args.requests / elapsed:>8.0f} {p50:>8.1f} "
+                  f"{p99:>8.1f} {stats['mean_batch_size']:>10.1f}  {histogram}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: load_models() time and memory, legacy pickles vs model bundle
+The current models are re-saved in each format to a temporary directory and
+every load runs in a fresh process. RssAnon is private memory; RssFile is
+file-backed memory that other processes mapping the same bundle share.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from bench_utils import MODEL_DIR, load_classifier, timed
+
+VARIANTS = [
+    ('legacy', 'legacy', {}),
+    ('bundle', 'bundle', {'memory_map': False}),
+    ('bundle + mmap', 'bundle', {'memory_map': True}),
+]
+
+
+def memory_status():
+    """Resident memory counters of this process in MB (Linux)"""
+    status = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('VmRSS', 'RssAnon', 'RssFile'):
+                status[key] = int(value.split()[0]) / 1024
+    return status
+
+
+def measure_load(model_dir, load_kwargs):
+    from disaster_classifier import DisasterClassifier
+
+    classifier = DisasterClassifier()
+    before = memory_status()
+    _, elapsed = timed(classifier.load_models, model_dir, **load_kwargs)
+    classifier.predict("Severe flooding in downtown area, need help")
+    after = memory_status()
+    return {'load_s': elapsed, **{key: after[key] - before[key] for key in after}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        model_dir, load_kwargs = json.loads(args.child)
+        print(json.dumps(measure_load(model_dir, load_kwargs)))
+        return
+
+    classifier = load_classifier(MODEL_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        for model_format in ('legacy', 'bundle'):
+            classifier.save_models(os.path.join(tmp, model_format), model_format=model_format)
+        sizes = {fmt: sum(os.path.getsize(os.path.join(tmp, fmt, name)) for name in os.listdir(os.path.join(tmp, fmt)))
+                 for fmt in ('legacy', 'bundle')}
+
+        print(f"\n=== load_models(): median of {args.repeat} fresh processes ===")
+        print(f"{'format':>14} {'size KB':>8} {'load ms':>8} {'RSS MB':>7} {'anon MB':>8} {'file MB':>8}")
+        for name, model_format, load_kwargs in VARIANTS:
+            runs = []
+            for _ in range(args.repeat):
+                child = json.dumps([os.path.join(tmp, model_format), load_kwargs])
+                output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', child],
+                                        capture_output=True, text=True, check=True).stdout
+                runs.append(json.loads(output.strip().splitlines()[-1]))
+            median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+            print(f"{name:>14} {sizes[model_format] / 1024:>8.0f} {median['load_s'] * 1000:>8.1f} "
+                  f"{median['VmRSS']:>7.1f} {median['RssAnon']:>8.1f} {median['RssFile']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-row predict() loop vs predict_batch()
+Also checks that both paths return the same predictions and confidences
+"""
+
+import argparse
+
+import numpy as np
+
+from bench_utils import synthetic_corpus, load_classifier, timed
+
+
+def predict_loop(classifier, texts):
+    return [classifier.predict(text) for text in texts]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--max-loop', type=int, default=2000,
+                        help='rows scored one by one per size (the loop is slow, so it is sampled)')
+    args = parser.parse_args()
+
+    classifier = load_classifier()
+
+    print("=== predict() loop vs predict_batch() ===")
+    print(f"{'rows':>8} {'loop rows/s':>12} {'batch rows/s':>13} {'speedup':>8} {'batch time':>11}")
+
+    for size in args.sizes:
+        texts = synthetic_corpus(size)
+
+        (predictions, confidences, _), batch_time = timed(classifier.predict_batch, texts)
+
+        loop_texts = texts[:args.max_loop]
+        loop_results, loop_time = timed(predict_loop, classifier, loop_texts)
+
+        # Row-for-row parity on the sampled rows
+        rows = len(loop_texts)
+        assert list(predictions[:rows]) == [r[0] for r in loop_results], "prediction mismatch"
+        assert np.allclose(confidences[:rows], [r[1] for r in loop_results]), "confidence mismatch"
+
+        loop_rate = rows / loop_time
+        batch_rate = size / batch_time
+        print(f"{size:>8} {loop_rate:>12.0f} {batch_rate:>13.0f} "
+              f"{batch_rate / loop_rate:>7.1f}x {batch_time:>10.2f}s")
+
+    print("\nBatch predictions match predict() row for row")
+
+
+if __name__ == "__main__":
+    main()
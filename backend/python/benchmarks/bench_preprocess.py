@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark: preprocess_text() time per 10k complaints
+Compares the uncached stemmer, the stem cache, and the cache with the
+whitespace tokenizer, and reports how often the whitespace tokenizer
+changes the output relative to NLTK word_tokenize
+"""
+
+import argparse
+
+from bench_utils import synthetic_corpus, timed
+# bench_utils puts the classifier modules on sys.path
+from disaster_classifier import DisasterClassifier
+
+CONFIGS = [
+    ('nltk, no cache', {'stem_cache_size': 0, 'tokenizer': 'nltk'}),
+    ('nltk, stem cache', {'tokenizer': 'nltk'}),
+    ('whitespace, stem cache', {'tokenizer': 'whitespace'}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    texts = synthetic_corpus(args.rows)
+
+    print(f"=== preprocess_text() over {args.rows} complaints ===")
+    print(f"{'configuration':>24} {'seconds':>8} {'per 10k':>8} {'stem hit rate':>14}")
+
+    outputs = {}
+    for name, kwargs in CONFIGS:
+        classifier = DisasterClassifier(**kwargs)
+        outputs[name], elapsed = timed(lambda: [classifier.preprocess_text(t) for t in texts])
+        stats = classifier.stem_cache_stats()
+        hit_rate = f"{stats['hit_rate']:.1%}" if stats['enabled'] else '-'
+        print(f"{name:>24} {elapsed:>8.2f} {elapsed * 10000 / args.rows:>8.2f} {hit_rate:>14}")
+
+    reference = outputs['nltk, no cache']
+    assert outputs['nltk, stem cache'] == reference, "stem cache changed preprocessing output"
+    changed = sum(a != b for a, b in zip(outputs['whitespace, stem cache'], reference))
+    print("\nStem cache output identical to uncached: yes")
+    print(f"Whitespace tokenizer differs from NLTK on {changed}/{len(texts)} texts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark: spam rules, per-call regex compilation vs the precompiled SpamClassifier
+Runs both over the same synthetic complaints (a share of them with a spam
+word mixed in) and checks that they agree on every text
+"""
+
+import argparse
+import random
+import re
+
+from bench_utils import synthetic_corpus, timed
+from spam_classifier import SPAM_WORDS, SpamClassifier
+
+
+def previous_is_spam(text):
+    """The rule check as it was before: one regex built and run per spam word"""
+    text = text.lower()
+    for word in SPAM_WORDS:
+        if re.search(r'\b' + re.escape(word) + r'\b', text):
+            return True
+    if text.count('!') > 3 or text.count('$') > 2:
+        return True
+    if len(text.split()) < 3:
+        return True
+    return False
+
+
+def spam_corpus(size, spam_share, seed=42):
+    """Synthetic complaints; spam_share of them get a spam word inserted"""
+    rng = random.Random(seed)
+    texts = synthetic_corpus(size, seed=seed)
+    for index in range(size):
+        if rng.random() < spam_share:
+            words = texts[index].split()
+            words.insert(rng.randint(0, len(words)), rng.choice(SPAM_WORDS).upper())
+            texts[index] = ' '.join(words)
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--spam-share', type=float, default=0.1)
+    args = parser.parse_args()
+
+    texts = spam_corpus(args.rows, args.spam_share)
+    classifier = SpamClassifier()
+
+    previous, previous_time = timed(lambda: [previous_is_spam(text) for text in texts])
+    current, current_time = timed(classifier.is_spam_many, texts)
+
+    assert previous == current, "spam verdict mismatch"
+
+    print(f"=== Spam rules over {args.rows} texts ({sum(current)} flagged) ===")
+    print(f"{'per-word regexes':>20} {previous_time:>7.2f}s {args.rows / previous_time:>10.0f} texts/s")
+    print(f"{'SpamClassifier':>20} {current_time:>7.2f}s {args.rows / current_time:>10.0f} texts/s")
+    print(f"speedup: {previous_time / current_time:.1f}x, verdicts identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full RBF SVC vs CompressedSVM per landmark count
+For each size, fits a CompressedSVM on the training split of the dataset and
+reports the held-out accuracy delta, agreement with the full SVM on a
+synthetic corpus, scoring speedup and pickled size
+"""
+
+import argparse
+import pickle
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from bench_utils import synthetic_corpus, load_classifier
+from compressed_svm import CompressedSVM, SVM_COMPRESSED_C, svm_gamma
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--landmarks', type=int, nargs='+', default=[25, 50, 100, 200])
+    parser.add_argument('--C', type=float, default=SVM_COMPRESSED_C)
+    parser.add_argument('--rows', type=int, default=5000, help='synthetic complaints for agreement and timing')
+    args = parser.parse_args()
+
+    classifier = load_classifier()
+    df = classifier.load_dataset()
+    X = classifier.build_features(list(df['text']))
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, df['label'], test_size=0.05, random_state=42, stratify=df['label']
+    )
+    X_synthetic = classifier.build_features(synthetic_corpus(args.rows))
+    full = classifier.svm_model
+    full_labels = full.predict(classifier.svm_input(X_synthetic))
+
+    print(f"\n=== Full SVC: {full.support_vectors_.shape[0]} support vectors, "
+          f"{len(pickle.dumps(full, protocol=5)) / 1024:.0f} KB pickled ===")
+    print(f"{'landmarks':>9} {'acc delta':>10} {'agreement':>10} {'1-row x':>8} {'batch x':>8} {'KB':>6}")
+    for landmarks in args.landmarks:
+        classifier.svm_compressed = CompressedSVM.fit(X_train, y_train, svm_gamma(full), landmarks, args.C)
+        evaluation = classifier.evaluate_svm_compression(X_test, y_test, X_synthetic)
+        agreement = np.mean(classifier.svm_compressed.predict(X_synthetic) == full_labels)
+        size = len(pickle.dumps(classifier.svm_compressed, protocol=5)) / 1024
+        print(f"{landmarks:>9} {evaluation['accuracy_delta']:>+10.3f} {agreement:>10.1%} "
+              f"{evaluation['single_row_speedup']:>7.1f}x {evaluation['batch_speedup']:>7.1f}x {size:>6.0f}")
+    print(f"\n(held-out split: {len(y_test)} rows; agreement over {args.rows} synthetic complaints)")
+
+
+if __name__ == "__main__":
+    main()
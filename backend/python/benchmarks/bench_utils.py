@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the classifier benchmarks
+Builds synthetic complaint corpora from the bundled dataset and loads the trained models
+"""
+
+import os
+import sys
+import time
+import random
+import csv
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PYTHON_DIR = os.path.dirname(BENCH_DIR)
+MODEL_DIR = os.path.join(PYTHON_DIR, 'models')
+DATASET_PATH = os.path.join(PYTHON_DIR, 'disaster_complaints_dataset.csv')
+
+# Benchmarks live one level below the classifier modules
+if PYTHON_DIR not in sys.path:
+    sys.path.insert(0, PYTHON_DIR)
+
+
+def load_seed_samples(csv_path=DATASET_PATH):
+    """Return (text, label) pairs from the dataset CSV"""
+    with open(csv_path, encoding='utf-8') as f:
+        return [(row['text'], int(row['label'])) for row in csv.DictReader(f)]
+
+
+def synthetic_corpus(size, seed=42, with_labels=False, csv_path=DATASET_PATH):
+    """
+    Generate `size` complaints by sampling the dataset with replacement
+    Half of the rows get a fragment of another sample of the same class appended,
+    so the corpus is not just exact repeats of the seed texts
+    """
+    samples = load_seed_samples(csv_path)
+    by_label = {}
+    for text, label in samples:
+        by_label.setdefault(label, []).append(text)
+
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        text, label = rng.choice(samples)
+        if rng.random() < 0.5:
+            words = rng.choice(by_label[label]).split()
+            text = f"{text} {' '.join(words[:rng.randint(1, len(words))])}"
+        corpus.append((text, label) if with_labels else text)
+
+    return corpus
+
+
+def load_classifier(model_dir=MODEL_DIR, **kwargs):
+    """Load the trained DisasterClassifier, exiting if no models are available"""
+    from disaster_classifier import DisasterClassifier
+
+    classifier = DisasterClassifier(**kwargs)
+    if not classifier.load_models(model_dir):
+        print("No trained models found. Please run train_disaster_model.py first.")
+        sys.exit(1)
+    return classifier
+
+
+def timed(func, *args, **kwargs):
+    """Run func once and return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
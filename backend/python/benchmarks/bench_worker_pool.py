@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Load test: WorkerPool latency and throughput by worker count
+Submits synthetic complaints as fast as the pool's backpressure allows and
+reports p50/p95/p99 latency (submit to result) and requests per second.
+The prediction cache is off by default so every request reaches the models.
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from bench_utils import synthetic_corpus, load_classifier
+from disaster_classifier import handle_request
+from worker_pool import WorkerPool
+
+
+def run_load(classifier, workers, queue_size, texts):
+    """Push every text through a fresh pool; returns (latencies in seconds, elapsed seconds)"""
+    pool = WorkerPool(classifier, handle_request, workers, queue_size).start()
+    submitted_at = {}
+    latencies = []
+
+    def collect():
+        for _ in range(len(texts)):
+            sequence, _ = pool.get_result()
+            latencies.append(time.perf_counter() - submitted_at[sequence])
+
+    collector = threading.Thread(target=collect)
+    collector.start()
+
+    start = time.perf_counter()
+    for text in texts:
+        sequence = pool.submitted
+        submitted_at[sequence] = time.perf_counter()
+        pool.submit({'text': text})
+    collector.join()
+    elapsed = time.perf_counter() - start
+
+    pool.close()
+    return np.array(latencies), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--queue-size', type=int, default=64)
+    parser.add_argument('--cache', action='store_true', help='enable the prediction cache in the workers')
+    args = parser.parse_args()
+
+    classifier = load_classifier(cache_size=10000 if args.cache else 0)
+    texts = synthetic_corpus(args.requests)
+
+    print(f"=== WorkerPool load test: {args.requests} requests, queue size {args.queue_size} ===")
+    print(f"{'workers':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+
+    for workers in args.workers:
+        latencies, elapsed = run_load(classifier, workers, args.queue_size, texts)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        print(f"{workers:>8} {args.requests / elapsed:>8.0f} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f}")
+
+    print("\nLatency includes time queued behind the in-flight requests (workers + queue size)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Reproducible classifier benchmark suite
+Runs every benchmark on synthetic corpora of a fixed size and seed built from
+disaster_complaints_dataset.csv and writes the metrics, the commit and the
+library versions to a JSON file, so runs on two commits can be compared:
+
+    python benchmarks/run_benchmarks.py --rows 5000 --output before.json
+    ... change something ...
+    python benchmarks/run_benchmarks.py --rows 5000 --output after.json
+    python benchmarks/run_benchmarks.py --compare before.json after.json
+
+Cold start and training run in fresh processes, so their peak memory is their
+own. Metric names carry their unit: *_ms, *_us, *_s and *_mb are better lower,
+*_per_s better higher. Compare runs on the same machine and the same models.
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from bench_utils import DATASET_PATH, MODEL_DIR, PYTHON_DIR, synthetic_corpus, timed
+
+RESULTS_FORMAT_VERSION = 1
+BENCHMARKS = ['cold_start', 'single_request', 'batch', 'preprocess', 'features', 'spam', 'training']
+FIRST_COMPLAINT = "Severe flooding in downtown area, need help"
+
+# Relative change beyond which --compare reports a regression
+DEFAULT_THRESHOLD = 0.10
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process (ru_maxrss is in KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def median_time(func, repeat):
+    return statistics.median(timed(func)[1] for _ in range(repeat))
+
+
+def git_commit():
+    """Short commit hash, with '-dirty' for uncommitted changes; None outside a git checkout"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=PYTHON_DIR, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                                text=True, cwd=PYTHON_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if status else commit
+
+
+def environment():
+    import numpy as np
+    import scipy
+    import sklearn
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+
+def run_child(task, **params):
+    """Run one benchmark in a fresh interpreter; returns its metrics"""
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', json.dumps({'task': task, **params})],
+                            capture_output=True, text=True, cwd=PYTHON_DIR)
+    if result.returncode != 0:
+        raise RuntimeError(f"{task} benchmark failed:\n{result.stderr.strip()}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def child_cold_start(tokenizer):
+    start = time.perf_counter()
+    from disaster_classifier import DisasterClassifier
+    imported = time.perf_counter()
+    classifier = DisasterClassifier(tokenizer=tokenizer)
+    if not classifier.load_models(MODEL_DIR):
+        raise RuntimeError(f"No trained models found in {MODEL_DIR}")
+    loaded = time.perf_counter()
+    classifier.predict(FIRST_COMPLAINT)
+    predicted = time.perf_counter()
+    return {
+        'import_ms': (imported - start) * 1000,
+        'load_models_ms': (loaded - imported) * 1000,
+        'first_predict_ms': (predicted - loaded) * 1000,
+        'total_ms': (predicted - start) * 1000,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def child_training(tokenizer, rows, seed, n_jobs):
+    from disaster_classifier import DisasterClassifier
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'train.csv')
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['text', 'label'])
+            writer.writerows(synthetic_corpus(rows, seed=seed, with_labels=True))
+
+        classifier = DisasterClassifier(tokenizer=tokenizer)
+        classifier.train_models(csv_path, n_jobs=n_jobs)
+
+    metrics = {f"{stage}_s": seconds for stage, seconds in classifier.training_timings.items()}
+    metrics['peak_rss_mb'] = peak_rss_mb()
+    return metrics
+
+
+def bench_cold_start(args, _):
+    runs = [run_child('cold_start', tokenizer=args.tokenizer) for _ in range(args.repeat)]
+    return {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+
+
+def bench_single_request(args, texts):
+    classifier = inference_classifier(args)
+    requests = texts[:args.requests]
+    for text in requests[:20]:
+        classifier.predict(text)
+
+    latencies = []
+    for text in requests:
+        _, elapsed = timed(classifier.predict, text)
+        latencies.append(elapsed * 1000)
+    return {
+        'mean_ms': statistics.fmean(latencies),
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99)
+    }
+
+
+def bench_batch(args, texts):
+    classifier = inference_classifier(args)
+    batches = [texts[start:start + args.batch_size] for start in range(0, len(texts), args.batch_size)]
+    classifier.predict_batch(batches[0])
+
+    elapsed = median_time(lambda: [classifier.predict_batch(batch) for batch in batches], args.repeat)
+    return {'rows_per_s': len(texts) / elapsed, 'batch_ms': elapsed * 1000 / len(batches)}
+
+
+def bench_preprocess(args, texts):
+    from disaster_classifier import DisasterClassifier
+
+    # A fresh classifier per run, so every run starts with an empty stem cache
+    elapsed = median_time(lambda: DisasterClassifier(tokenizer=args.tokenizer).preprocess_texts(texts), args.repeat)
+    return {'rows_per_s': len(texts) / elapsed}
+
+
+def bench_features(args, texts):
+    from disaster_classifier import DisasterClassifier
+
+    classifier = DisasterClassifier(tokenizer=args.tokenizer)
+    elapsed = median_time(lambda: [classifier.extract_features(text) for text in texts], args.repeat)
+    return {'extract_features_us': elapsed * 1e6 / len(texts)}
+
+
+def bench_spam(args, texts):
+    from spam_classifier import SpamClassifier
+
+    classifier = SpamClassifier()
+    elapsed = median_time(lambda: classifier.is_spam_many(texts), args.repeat)
+    return {'rows_per_s': len(texts) / elapsed, 'is_spam_us': elapsed * 1e6 / len(texts)}
+
+
+def bench_training(args, _):
+    return run_child('training', tokenizer=args.tokenizer, rows=args.train_rows, seed=args.seed, n_jobs=args.n_jobs)
+
+
+def inference_classifier(args):
+    from bench_utils import load_classifier
+
+    # No prediction cache: repeated synthetic texts would otherwise measure cache hits
+    return load_classifier(MODEL_DIR, tokenizer=args.tokenizer, cache_size=0)
+
+
+def run_suite(args):
+    texts = synthetic_corpus(args.rows, seed=args.seed)
+    results = {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': git_commit(),
+        'environment': environment(),
+        'parameters': {
+            'rows': args.rows, 'train_rows': args.train_rows, 'seed': args.seed,
+            'repeat': args.repeat, 'requests': args.requests, 'batch_size': args.batch_size,
+            'n_jobs': args.n_jobs, 'tokenizer': args.tokenizer,
+            'dataset': os.path.relpath(DATASET_PATH, PYTHON_DIR)
+        },
+        'metrics': {}
+    }
+
+    for name in args.only or BENCHMARKS:
+        print(f"Running {name}...", file=sys.stderr)
+        with redirect_stdout(sys.stderr):
+            metrics = globals()[f"bench_{name}"](args, texts)
+        results['metrics'][name] = {metric: round(value, 4) for metric, value in metrics.items()}
+
+    # In-process benchmarks share one process, so only their common peak is meaningful
+    results['metrics']['process'] = {'peak_rss_mb': round(peak_rss_mb(), 1)}
+    return results
+
+
+def higher_is_better(metric):
+    return metric.endswith('_per_s')
+
+
+def compare(baseline, current, threshold):
+    """Print metric changes between two result files; returns the regressed metric names"""
+    for label, results in (('baseline', baseline), ('current', current)):
+        print(f"{label:>8}: {results.get('commit')}  {results.get('created')}")
+    if baseline.get('parameters') != current.get('parameters'):
+        print("warning: the runs used different parameters")
+    if baseline.get('environment') != current.get('environment'):
+        print("warning: the runs used different environments")
+
+    regressions = []
+    print(f"\n{'metric':<36} {'baseline':>12} {'current':>12} {'change':>9}")
+    for benchmark, metrics in current['metrics'].items():
+        for metric, value in metrics.items():
+            name = f"{benchmark}.{metric}"
+            old = baseline['metrics'].get(benchmark, {}).get(metric)
+            if old is None:
+                print(f"{name:<36} {'-':>12} {value:>12.4g} {'new':>9}")
+                continue
+
+            change = (value - old) / old if old else 0.0
+            worse = -change if higher_is_better(metric) else change
+            flag = ''
+            if worse > threshold:
+                flag = '  REGRESSION'
+                regressions.append(name)
+            elif worse < -threshold:
+                flag = '  improved'
+            print(f"{name:<36} {old:>12.4g} {value:>12.4g} {change:>+9.1%}{flag}")
+    return regressions
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000, help='synthetic complaints per inference benchmark')
+    parser.add_argument('--train-rows', type=int, default=2000, help='synthetic complaints for the training benchmark')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3, help='runs per benchmark; the median is reported')
+    parser.add_argument('--requests', type=int, default=500, help='predict() calls for the single-request latency')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--n-jobs', type=int, default=1, help='training parallelism (1 for stable numbers)')
+    parser.add_argument('--tokenizer', choices=['nltk', 'whitespace'], default='nltk')
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help='run only these benchmarks')
+    parser.add_argument('--output', help='results file (default: benchmarks/results/<time>-<commit>.json)')
+    parser.add_argument('--baseline', help='compare this run against an earlier results file')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help='compare two results files and exit')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative change reported as a regression (default 0.10)')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        params = json.loads(args.child)
+        task = params.pop('task')
+        with redirect_stdout(sys.stderr):
+            metrics = globals()[f"child_{task}"](**params)
+        print(json.dumps(metrics))
+        return
+
+    if args.compare:
+        regressions = compare(load_results(args.compare[0]), load_results(args.compare[1]), args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    results = run_suite(args)
+
+    output = args.output
+    if output is None:
+        results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+        os.makedirs(results_dir, exist_ok=True)
+        output = os.path.join(results_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{results['commit'] or 'nogit'}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    for benchmark, metrics in results['metrics'].items():
+        print(f"=== {benchmark} ===")
+        for metric, value in metrics.items():
+            print(f"  {metric:<22} {value:>12.4g}")
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        print()
+        regressions = compare(load_results(args.baseline), results, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
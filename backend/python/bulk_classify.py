@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Streaming bulk classification of CSV / JSONL complaint files
+Input rows are read lazily and scored in fixed-size chunks with
+predict_batch(); each chunk's results are appended to the output file
+before the next chunk is read, so memory stays flat for any input size
+and an interrupted run can resume after the last row written
+"""
+
+import sys
+import os
+import csv
+import json
+from itertools import islice
+
+FILE_FORMATS = ('csv', 'jsonl')
+OUTPUT_FIELDS = ['row', 'result', 'confidence']
+
+
+def file_format(path, file_format=None):
+    """csv or jsonl, from the explicit format or the file extension"""
+    if file_format is None:
+        extension = os.path.splitext(path)[1].lower()
+        file_format = {'.csv': 'csv', '.jsonl': 'jsonl', '.json': 'jsonl', '.ndjson': 'jsonl'}.get(extension)
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Cannot tell the format of '{path}', expected one of {FILE_FORMATS}")
+    return file_format
+
+
+def read_records(f, input_format):
+    """Yield one dict per input row"""
+    if input_format == 'csv':
+        yield from csv.DictReader(f)
+        return
+
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {line_number} is not a JSON object")
+        yield record
+
+
+def record_text(record, text_field):
+    text = record.get(text_field)
+    if text is None:
+        return ''
+    return text if isinstance(text, str) else str(text)
+
+
+def resume_row(output_path, output_format):
+    """
+    Index of the first input row not yet in the output file
+    A partially written last record (from a crash mid-write) is truncated away
+    """
+    if not os.path.exists(output_path):
+        return 0
+
+    with open(output_path, 'rb+') as f:
+        data = f.read()
+        if output_format == 'csv':
+            end, header, record = complete_csv_records(data)
+            last = dict(zip(header, record)) if record is not header else None
+        else:
+            # json.dumps escapes newlines, so every complete JSONL record ends at a newline
+            end = data.rfind(b'\n') + 1
+            lines = data[:end].splitlines()
+            last = json.loads(lines[-1].decode('utf-8')) if lines else None
+        if end < len(data):
+            f.truncate(end)
+
+    return 0 if last is None else int(last['row']) + 1
+
+
+def complete_csv_records(data):
+    """
+    (end, first, last) for CSV bytes: the offset just past the last complete
+    record, and the first (header) and last complete records, or None.
+    Records are split by the csv module, so a quoted field that contains
+    newlines (e.g. an id value) is never cut into fragments
+    """
+    consumed = 0
+
+    def lines():
+        nonlocal consumed
+        for line in data.splitlines(keepends=True):
+            consumed += len(line)
+            yield line.decode('utf-8', errors='replace')
+
+    end, first, last = 0, None, None
+    try:
+        # csv.reader pulls lines only until the current record is complete
+        for record in csv.reader(lines(), strict=True):
+            if data[consumed - 1:consumed] != b'\n':
+                # Last record cut off before the end of its \r\n terminator
+                break
+            end, last = consumed, record
+            first = first or record
+    except csv.Error:
+        # The data ends inside a quoted field
+        pass
+    return end, first, last
+
+
+def classify_file(classifier, input_path, output_path, text_field='text', id_field=None,
+                  chunk_size=1000, start_row=0, resume=False, input_format=None, output_format=None):
+    """
+    Classify every row of a CSV/JSONL file into a CSV/JSONL output file
+    Output rows carry the input row index, the id field (if given), the
+    result and the confidence. With resume=True the run continues after the
+    last row already in the output; start_row skips rows explicitly.
+    Returns the number of rows classified by this run
+    """
+    input_format = file_format(input_path, input_format)
+    output_format = file_format(output_path, output_format)
+    fields = OUTPUT_FIELDS[:1] + ([id_field] if id_field else []) + OUTPUT_FIELDS[1:]
+
+    if resume:
+        start_row = max(start_row, resume_row(output_path, output_format))
+    append = resume and os.path.exists(output_path) and os.path.getsize(output_path) > 0
+
+    classified = 0
+    with open(input_path, newline='', encoding='utf-8') as source, \
+            open(output_path, 'a' if append else 'w', newline='', encoding='utf-8') as sink:
+        writer = None
+        if output_format == 'csv':
+            writer = csv.DictWriter(sink, fieldnames=fields)
+            if not append:
+                writer.writeheader()
+
+        records = islice(read_records(source, input_format), start_row, None)
+        row = start_row
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+
+            predictions, confidences, _ = classifier.predict_batch([record_text(record, text_field) for record in chunk])
+
+            for record, prediction, confidence in zip(chunk, predictions, confidences):
+                result = {'row': row}
+                if id_field:
+                    result[id_field] = record.get(id_field)
+                result['result'] = prediction
+                result['confidence'] = round(float(confidence), 3)
+                if writer is not None:
+                    writer.writerow(result)
+                else:
+                    sink.write(json.dumps(result) + '\n')
+                row += 1
+
+            # A chunk is on disk before the next one is read, so resume loses at most one chunk
+            sink.flush()
+            classified += len(chunk)
+            print(f"Classified rows {row - len(chunk)}-{row - 1}", file=sys.stderr)
+
+    return classified
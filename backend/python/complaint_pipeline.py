@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Complete complaint classification in one process
+Runs the spam rules first and stops on spam; otherwise loads the disaster
+models and runs the ensemble. Prints one JSON verdict with per-stage timings:
+    {"spam": false, "result": "verified", "confidence": 0.917, "timings_ms": {...}}
+"""
+
+import sys
+import os
+import json
+import time
+from contextlib import redirect_stdout
+
+from spam_classifier import is_spam
+
+
+def classify_complaint(text, classifier=None, model_dir=None, spam_cache=None, metrics=None):
+    """
+    Spam check, then disaster classification, as the complaint flow runs them
+    The disaster models are only loaded (when no classifier is passed) if the
+    complaint is not spam. Errors fall back to not_verified, as in the CLIs.
+    An optional StageMetrics records the spam check, and the model stages of
+    a classifier loaded here; a passed classifier records into its own.
+    """
+    timings = {}
+    start = time.perf_counter()
+
+    def lap(stage, since):
+        now = time.perf_counter()
+        timings[stage] = round((now - since) * 1000, 3)
+        return now
+
+    spam = is_spam(text, cache=spam_cache, metrics=metrics)
+    stage_start = lap('spam', start)
+    verdict = {'spam': spam, 'result': 'not_verified'}
+
+    if not spam:
+        try:
+            if classifier is None:
+                classifier = load_classifier(model_dir, metrics)
+                stage_start = lap('model_load', stage_start)
+
+            prediction, confidence, _ = classifier.predict(text)
+            lap('disaster', stage_start)
+            verdict['result'] = prediction
+            verdict['confidence'] = round(float(confidence), 3)
+        except Exception as e:
+            verdict['error'] = str(e)
+
+    lap('total', start)
+    verdict['timings_ms'] = timings
+    return verdict
+
+
+def load_classifier(model_dir=None, metrics=None):
+    """Load the saved disaster models; raises if there are none"""
+    from disaster_classifier import DisasterClassifier
+
+    if model_dir is None:
+        model_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+
+    classifier = DisasterClassifier(metrics=metrics)
+    if not classifier.load_models(model_dir):
+        raise RuntimeError(f"No trained models found in {model_dir}")
+    return classifier
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python complaint_pipeline.py <complaint_text>")
+        sys.exit(1)
+
+    # stdout carries only the JSON verdict, so status messages go to stderr
+    with redirect_stdout(sys.stderr):
+        verdict = classify_complaint(sys.argv[1])
+    print(json.dumps(verdict))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,42 +7,174 @@ Returns: 'verified' for disaster-related, 'not_verified' for non-disaster-relate
 
 import sys
 import os
+import json
 import pickle
+import hashlib
+import uuid
+import mmap
+import queue
+import threading
+import time
 import numpy as np
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.svm import SVC
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
-from sklearn.pipeline import Pipeline
+from scipy import sparse
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import PorterStemmer
+from contextlib import redirect_stdout
+from functools import lru_cache
+from keyword_matcher import KeywordMatcher
+from prediction_cache import PredictionCache
+from worker_pool import WorkerPool
+from micro_batcher import MicroBatcher
+from model_registry import ModelRegistry, CURRENT_VERSION_FILE, open_atomic, write_atomic
+from stage_metrics import StageMetrics, stage_timer
 import warnings
 warnings.filterwarnings('ignore')
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# pandas and the training parts of scikit-learn are imported inside the training
+# methods, and NLTK when a classifier is created, so scoring with saved models
+# only loads what inference needs (unpickling the models pulls in the rest)
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# Required NLTK data, resolved on first use instead of at import time
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords'
+}
+_resolved_nltk_resources = set()
+
+def ensure_nltk_resource(name):
+    """Make sure an NLTK resource is available, downloading it only if it is missing"""
+    if name in _resolved_nltk_resources:
+        return
+    
+    import nltk
+    try:
+        nltk.data.find(NLTK_RESOURCES[name])
+    except LookupError:
+        nltk.download(name)
+    _resolved_nltk_resources.add(name)
+
+NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]')
+
+TOKENIZERS = ('nltk', 'whitespace')
+
+# Model storage: a memory-mappable bundle, or the original three pickles.
+# The bundle is a pickle (protocol 5) of the model objects whose numpy array
+# data is written out-of-band to one aligned binary file, plus JSON metadata
+MODEL_FORMATS = ('bundle', 'legacy')
+BUNDLE_GRAPH_FILE = 'model_bundle.pkl'
+BUNDLE_DATA_FILE = 'model_bundle.bin'
+BUNDLE_METADATA_FILE = 'model_bundle.json'
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_ALIGNMENT = 64
+LINEAR_MODEL_FILE = 'linear_model.pkl'
+SVM_COMPRESSED_FILE = 'svm_compressed.pkl'
+BUNDLE_FILES = (BUNDLE_GRAPH_FILE, BUNDLE_DATA_FILE, BUNDLE_METADATA_FILE)
+LEGACY_FILES = ('rf_model.pkl', 'svm_model.pkl', 'vectorizer.pkl', LINEAR_MODEL_FILE, SVM_COMPRESSED_FILE)
+
+# 'compressed' scores with the CompressedSVM (see compressed_svm.py) when one was trained
+SVM_VARIANTS = ('full', 'compressed')
+
+# Precision of the feature matrix (and of the models' arrays where the model
+# type allows it). The vectorizer records it, so models trained in float32 are
+# also scored in float32
+FEATURE_DTYPES = ('float64', 'float32')
+
+# Training hyperparameters; train_models() accepts overrides for each model
+RF_PARAMS = {
+    'n_estimators': 100,
+    'max_depth': 10,
+    'random_state': 42,
+    'class_weight': 'balanced'
+}
+SVM_PARAMS = {
+    'kernel': 'rbf',
+    'C': 1.0,
+    'gamma': 'scale',
+    'probability': True,
+    'random_state': 42,
+    'class_weight': 'balanced'
+}
+
+DEFAULT_DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'disaster_complaints_dataset.csv')
+
+# Out-of-core training: hashed n-gram features (no vocabulary to hold in memory)
+# and a linear model fitted chunk by chunk; every 20th row is held out for evaluation
+INCREMENTAL_HASH_FEATURES = 2 ** 18
+INCREMENTAL_TEST_EVERY = 20
+
+# Below this many texts a process pool costs more than it saves
+PARALLEL_PREPROCESS_MIN_ROWS = 5000
+# Bumped whenever preprocessing or feature extraction changes; part of the cached
+# features' key and of the feature schema recorded for published models
+FEATURE_CACHE_VERSION = 1
+
+_preprocess_worker = None
+
+def _init_preprocess_worker(tokenizer):
+    global _preprocess_worker
+    _preprocess_worker = DisasterClassifier(tokenizer=tokenizer)
+
+def _preprocess_in_worker(text):
+    return _preprocess_worker.preprocess_text(text)
 
 class DisasterClassifier:
-    def __init__(self):
+    def __init__(self, keyword_word_boundary=False, stem_cache_size=10000, tokenizer='nltk',
+                 cache_size=0, cache_ttl=None, cascade=False, cascade_thresholds=(0.1, 0.9),
+                 metrics=False, svm_variant='full', dtype='float64'):
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer '{tokenizer}', expected one of {TOKENIZERS}")
+        if svm_variant not in SVM_VARIANTS:
+            raise ValueError(f"Unknown SVM variant '{svm_variant}', expected one of {SVM_VARIANTS}")
+        if dtype not in FEATURE_DTYPES:
+            raise ValueError(f"Unknown feature dtype '{dtype}', expected one of {FEATURE_DTYPES}")
+        
         self.rf_model = None
         self.svm_model = None
+        self.svm_compressed = None
+        self.svm_variant = svm_variant
+        # Feature precision for training; loaded models bring their own (see feature_dtype())
+        self.dtype = np.dtype(dtype)
         self.vectorizer = None
+        self.linear_model = None
+        self.model_version = None
+        self.training_metrics = {}
+        
+        # Where the models came from, for hot reloads of the registry's current version
+        self.model_dir = None
+        self.registry_version = None
+        self.last_reload_check = 0.0
+        
+        # Cascade mode: a linear model decides rows whose P(verified) is at or
+        # outside the (low, high) thresholds; only the band in between goes to RF+SVM
+        low, high = cascade_thresholds
+        if not 0.0 <= low < high <= 1.0:
+            raise ValueError(f"Invalid cascade thresholds {cascade_thresholds}, expected 0 <= low < high <= 1")
+        self.cascade = cascade
+        self.cascade_thresholds = (low, high)
+        self.cascade_counts = {'linear': 0, 'ensemble': 0}
+        
+        # Optional per-stage latency histograms (see stage_metrics); True creates
+        # a StageMetrics, an instance can be shared with e.g. a SpamClassifier
+        self.metrics = StageMetrics() if metrics is True else (metrics or None)
+        from nltk.corpus import stopwords
+        from nltk.stem import PorterStemmer
+        
+        ensure_nltk_resource('stopwords')
         self.stemmer = PorterStemmer()
         self.stop_words = set(stopwords.words('english'))
         
+        # Complaint vocabulary is small and repetitive, so stemming is memoized.
+        # 'whitespace' skips word_tokenize: after the cleanup regex only letters and
+        # whitespace remain, and it differs from NLTK only on contractions like "cannot"
+        self.tokenizer = tokenizer
+        if tokenizer == 'nltk':
+            from nltk.tokenize import word_tokenize
+            
+            ensure_nltk_resource('punkt')
+            self.word_tokenize = word_tokenize
+        self.stem = self.stemmer.stem
+        if stem_cache_size:
+            self.stem = lru_cache(maxsize=stem_cache_size)(self.stem)
+        
         # Disaster-related keywords
         self.disaster_keywords = [
             'flood', 'flooding', 'flooded', 'water', 'rain', 'storm', 'hurricane',
@@ -57,6 +189,20 @@ class DisasterClassifier:
             'infrastructure', 'utility', 'communication down', 'network down'
         ]
         
+        # Optional cache of predict() results, keyed by normalized text + model version
+        self.prediction_cache = PredictionCache(cache_size, cache_ttl) if cache_size else None
+        
+        # Urgency indicators
+        self.urgency_words = ['urgent', 'emergency', 'help', 'asap', 'immediate', 'now']
+        
+        # One precompiled scan counts both keyword groups. The default substring
+        # semantics match the features the saved models were trained on;
+        # word-boundary matching ("help" no longer matches "helpful") needs retraining
+        self.keyword_matcher = KeywordMatcher(
+            {'disaster': self.disaster_keywords, 'urgency': self.urgency_words},
+            word_boundary=keyword_word_boundary
+        )
+        
     def preprocess_text(self, text):
         """Preprocess text for classification"""
         if not isinstance(text, str):
@@ -66,34 +212,49 @@ class DisasterClassifier:
         text = text.lower()
         
         # Remove special characters and digits
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = NON_ALPHA_PATTERN.sub('', text)
         
         # Tokenize
-        tokens = word_tokenize(text)
+        tokens = text.split() if self.tokenizer == 'whitespace' else self.word_tokenize(text)
         
         # Remove stopwords and stem
-        tokens = [self.stemmer.stem(token) for token in tokens 
+        tokens = [self.stem(token) for token in tokens 
                  if token not in self.stop_words and len(token) > 2]
         
         return ' '.join(tokens)
     
+    def stem_cache_stats(self):
+        """Return hit/miss counters and hit rate of the stem cache"""
+        if not hasattr(self.stem, 'cache_info'):
+            return {'enabled': False}
+        
+        info = self.stem.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'enabled': True,
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize,
+            'hit_rate': info.hits / lookups if lookups else 0.0
+        }
+    
     def extract_features(self, text):
         """Extract additional features from text"""
         features = {}
         
+        # Disaster keyword and urgency counts in a single scan
+        keyword_counts = self.keyword_matcher.count(text)
+        
         # Disaster keyword count
-        disaster_count = sum(1 for keyword in self.disaster_keywords 
-                           if keyword.lower() in text.lower())
-        features['disaster_keyword_count'] = disaster_count
+        features['disaster_keyword_count'] = keyword_counts['disaster']
         
         # Text length
         features['text_length'] = len(text)
         features['word_count'] = len(text.split())
         
         # Urgency indicators
-        urgency_words = ['urgent', 'emergency', 'help', 'asap', 'immediate', 'now']
-        features['urgency_count'] = sum(1 for word in urgency_words 
-                                      if word in text.lower())
+        features['urgency_count'] = keyword_counts['urgency']
         
         # Exclamation marks (urgency indicator)
         features['exclamation_count'] = text.count('!')
@@ -102,10 +263,11 @@ class DisasterClassifier:
     
     def load_dataset(self, csv_path=None):
         """Load dataset from CSV file"""
+        import pandas as pd
+        
         if csv_path is None:
             # Default to the provided dataset
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            csv_path = os.path.join(script_dir, 'disaster_complaints_dataset.csv')
+            csv_path = DEFAULT_DATASET_PATH
         
         try:
             # Load the CSV dataset
@@ -132,6 +294,8 @@ class DisasterClassifier:
     
     def create_sample_data(self):
         """Create sample training data for disaster classification (fallback)"""
+        import pandas as pd
+        
         disaster_samples = [
             "Severe flooding in downtown area, need immediate evacuation assistance",
             "Earthquake damaged our building, people trapped inside, send help",
@@ -184,66 +348,72 @@ class DisasterClassifier:
         
         return pd.DataFrame({'text': texts, 'label': labels})
     
-    def train_models(self, csv_path=None):
-        """Train both Random Forest and SVM models"""
-        print("Loading dataset...")
-        df = self.load_dataset(csv_path)
+    def create_vectorizer(self):
+        """Create an unfitted TF-IDF vectorizer with the training configuration"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
         
-        # Preprocess texts
-        df['processed_text'] = df['text'].apply(self.preprocess_text)
-        
-        # Create TF-IDF vectorizer
-        self.vectorizer = TfidfVectorizer(
+        return TfidfVectorizer(
             max_features=1000,
             ngram_range=(1, 2),
             min_df=1,
-            max_df=0.95
+            max_df=0.95,
+            dtype=self.dtype.type
         )
+    
+    def train_models(self, csv_path=None, n_jobs=-1, cache_dir=None, rf_params=None, svm_params=None):
+        """
+        Train both Random Forest and SVM models
+        n_jobs processes/threads preprocess the texts, build the forest and run
+        the CV folds (-1 = all cores). With cache_dir, the preprocessed texts,
+        fitted vectorizer and feature matrix are reused across runs on the same
+        data, so retraining with other rf_params/svm_params skips them.
+        Wall-clock time per stage is kept in self.training_timings.
+        """
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.svm import SVC
+        from sklearn.model_selection import train_test_split, cross_val_score
+        from sklearn.metrics import accuracy_score
         
-        # Fit vectorizer and transform texts
-        X_text = self.vectorizer.fit_transform(df['processed_text'])
+        timings = self.training_timings = {}
+        start = stage_start = time.perf_counter()
         
-        # Extract additional features
-        additional_features = []
-        for text in df['text']:
-            features = self.extract_features(text)
-            additional_features.append(list(features.values()))
+        def lap(stage):
+            nonlocal stage_start
+            now = time.perf_counter()
+            timings[stage] = now - stage_start
+            stage_start = now
         
-        additional_features = np.array(additional_features)
+        print("Loading dataset...")
+        df = self.load_dataset(csv_path)
+        lap('load')
         
-        # Combine text features with additional features
-        X = np.hstack([X_text.toarray(), additional_features])
-        y = df['label']
+        X, y = self.training_features(df, n_jobs, cache_dir, lap)
         
         # Split data with 95% train, 5% test
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.05, random_state=42, stratify=y
         )
         
-        print(f"Training set size: {len(X_train)} samples ({len(X_train)/len(X)*100:.1f}%)")
-        print(f"Test set size: {len(X_test)} samples ({len(X_test)/len(X)*100:.1f}%)")
+        n_samples, n_train, n_test = X.shape[0], X_train.shape[0], X_test.shape[0]
+        print(f"Training set size: {n_train} samples ({n_train/n_samples*100:.1f}%)")
+        print(f"Test set size: {n_test} samples ({n_test/n_samples*100:.1f}%)")
         
         print("Training Random Forest model...")
-        # Train Random Forest
-        self.rf_model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            random_state=42,
-            class_weight='balanced'
-        )
+        # Train Random Forest, building the trees in parallel
+        self.rf_model = RandomForestClassifier(**{**RF_PARAMS, **(rf_params or {}), 'n_jobs': n_jobs})
         self.rf_model.fit(X_train, y_train)
+        lap('rf_fit')
         
         print("Training SVM model...")
-        # Train SVM
-        self.svm_model = SVC(
-            kernel='rbf',
-            C=1.0,
-            gamma='scale',
-            probability=True,
-            random_state=42,
-            class_weight='balanced'
-        )
+        # Train SVM (its internal Platt calibration folds run serially in libsvm)
+        self.svm_model = SVC(**{**SVM_PARAMS, **(svm_params or {})})
         self.svm_model.fit(X_train, y_train)
+        self.svm_compressed = None
+        lap('svm_fit')
+        
+        print("Training linear cascade model...")
+        self.fit_linear_model(X_train, y_train)
+        lap('linear_fit')
         
         # Evaluate models
         print("\n=== Model Evaluation ===")
@@ -258,117 +428,1174 @@ class DisasterClassifier:
         svm_accuracy = accuracy_score(y_test, svm_pred)
         print(f"SVM Accuracy: {svm_accuracy:.3f}")
         
-        # Cross-validation scores
-        rf_cv_scores = cross_val_score(self.rf_model, X_train, y_train, cv=5)
-        svm_cv_scores = cross_val_score(self.svm_model, X_train, y_train, cv=5)
+        cascade_evaluation = self.print_cascade_evaluation(X_test, y_test)
+        lap('evaluate')
+        
+        # Cross-validation scores, folds fitted in parallel
+        rf_cv_scores = cross_val_score(self.rf_model, X_train, y_train, cv=5, n_jobs=n_jobs)
+        svm_cv_scores = cross_val_score(self.svm_model, X_train, y_train, cv=5, n_jobs=n_jobs)
         
         print(f"Random Forest CV Score: {rf_cv_scores.mean():.3f} (+/- {rf_cv_scores.std() * 2:.3f})")
         print(f"SVM CV Score: {svm_cv_scores.mean():.3f} (+/- {svm_cv_scores.std() * 2:.3f})")
+        lap('cross_validation')
+        
+        # Scoring one complaint on a thread pool is slower than on one core
+        self.rf_model.n_jobs = None
+        
+        self.set_model_version(f"trained-{uuid.uuid4().hex[:8]}")
+        
+        timings['total'] = time.perf_counter() - start
+        self.training_metrics = {
+            'train_rows': n_train,
+            'test_rows': n_test,
+            'rf_accuracy': float(rf_accuracy),
+            'svm_accuracy': float(svm_accuracy),
+            'rf_cv_accuracy': float(rf_cv_scores.mean()),
+            'svm_cv_accuracy': float(svm_cv_scores.mean()),
+            'linear_accuracy': cascade_evaluation['linear_accuracy'],
+            'ensemble_accuracy': cascade_evaluation['ensemble_accuracy'],
+            'training_seconds': round(timings['total'], 3)
+        }
+        print("\n=== Training Time ===")
+        for stage, seconds in timings.items():
+            print(f"{stage:>18}: {seconds:8.2f}s")
         
         return X_test, y_test
     
+    def train_incremental(self, csv_path=None, chunk_size=10000, epochs=5, n_features=INCREMENTAL_HASH_FEATURES):
+        """
+        Out-of-core training for archives too large for train_models()
+        The CSV is streamed in chunks of chunk_size rows through a stateless
+        HashingVectorizer, and an SGD logistic regression is fitted with
+        partial_fit, so memory is bounded by the chunk size. A first pass
+        fits the feature scaler and the class weights, then `epochs` passes
+        train the model and a last pass scores the held-out rows.
+        The result replaces the ensemble: predict() uses the linear model alone.
+        """
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import SGDClassifier
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import MaxAbsScaler
+        
+        csv_path = csv_path or DEFAULT_DATASET_PATH
+        self.vectorizer = HashingVectorizer(n_features=n_features, ngram_range=(1, 2), alternate_sign=False,
+                                            dtype=self.dtype.type)
+        
+        print("Fitting feature scale and class weights...")
+        scaler = MaxAbsScaler()
+        class_counts = {}
+        for X, y, test in self._incremental_chunks(csv_path, chunk_size):
+            scaler.partial_fit(X[~test])
+            for label, count in zip(*np.unique(y[~test], return_counts=True)):
+                class_counts[label] = class_counts.get(label, 0) + int(count)
+        
+        if len(class_counts) < 2:
+            raise ValueError(f"Incremental training needs both classes, found {sorted(class_counts)}")
+        
+        # Same weighting as class_weight='balanced', which partial_fit does not support
+        classes = np.array(sorted(class_counts), dtype=object)
+        rows = sum(class_counts.values())
+        model = SGDClassifier(
+            loss='log_loss',
+            alpha=1e-5,
+            class_weight={label: rows / (len(classes) * count) for label, count in class_counts.items()},
+            random_state=42
+        )
+        
+        rng = np.random.default_rng(42)
+        for epoch in range(1, epochs + 1):
+            print(f"Training epoch {epoch}/{epochs}...")
+            for X, y, test in self._incremental_chunks(csv_path, chunk_size):
+                order = rng.permutation(np.flatnonzero(~test))
+                model.partial_fit(scaler.transform(X[order]), y[order], classes=classes)
+        
+        self.rf_model = None
+        self.svm_model = None
+        self.svm_compressed = None
+        self.linear_model = make_pipeline(scaler, model)
+        
+        correct = total = 0
+        for X, y, test in self._incremental_chunks(csv_path, chunk_size):
+            if test.any():
+                correct += int(np.sum(self.linear_model.predict(X[test]) == y[test]))
+                total += int(test.sum())
+        
+        print(f"Trained on {rows} rows, held out {total}")
+        self.training_metrics = {'train_rows': rows, 'test_rows': total, 'epochs': epochs}
+        if total:
+            print(f"Incremental Model Accuracy: {correct / total:.3f}")
+            self.training_metrics['linear_accuracy'] = correct / total
+        
+        self.set_model_version(f"incremental-{uuid.uuid4().hex[:8]}")
+    
+    def _incremental_chunks(self, csv_path, chunk_size):
+        """Yield (features, labels, held-out mask) per chunk of the dataset CSV"""
+        import pandas as pd
+        
+        offset = 0
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+            chunk = chunk.dropna(subset=['label'])
+            texts = chunk['text'].fillna('').astype(str).tolist()
+            labels = chunk['label'].astype(int).map({1: 'verified', 0: 'not_verified'}).to_numpy(dtype=object)
+            
+            test = (np.arange(offset, offset + len(texts)) % INCREMENTAL_TEST_EVERY) == 0
+            offset += len(texts)
+            yield self.build_features(texts), labels, test
+    
+    def supports_updates(self):
+        """True if the active model can learn from new labels without a retrain"""
+        return self.linear_model is not None and hasattr(self.linear_model[-1], 'partial_fit')
+    
+    def update(self, texts, labels):
+        """
+        Fit the partial_fit linear model (from train_incremental) on newly
+        labeled complaints; labels are 'verified' / 'not_verified'
+        """
+        if not self.supports_updates():
+            raise ValueError("Online updates need an incrementally trained model. Train with train_incremental() first.")
+        
+        labels = np.asarray(labels, dtype=object)
+        unknown = set(labels) - set(self.linear_model.classes_)
+        if unknown:
+            raise ValueError(f"Unknown labels {sorted(unknown)}, expected {list(self.linear_model.classes_)}")
+        
+        # The feature scale stays as fitted, so earlier weights keep their meaning
+        scaler, model = self.linear_model[0], self.linear_model[-1]
+        model.partial_fit(scaler.transform(self.build_features(list(texts))), labels)
+        
+        self.set_model_version(f"{self.model_version}+update-{uuid.uuid4().hex[:8]}")
+    
+    def training_features(self, df, n_jobs=-1, cache_dir=None, lap=None):
+        """
+        Fit the vectorizer on the dataset and return (X, y)
+        Reuses a cached result for the same data and feature configuration
+        """
+        import sklearn
+        
+        lap = lap or (lambda stage: None)
+        cache_path = None
+        if cache_dir:
+            import pandas as pd
+            
+            digest = hashlib.sha256()
+            digest.update(pd.util.hash_pandas_object(df[['text', 'label']], index=False).values.tobytes())
+            digest.update(json.dumps([
+                FEATURE_CACHE_VERSION, sklearn.__version__, self.tokenizer,
+                self.keyword_matcher.word_boundary, sorted(self.stop_words),
+                self.disaster_keywords, self.urgency_words,
+                repr(sorted(self.create_vectorizer().get_params().items()))
+            ]).encode('utf-8'))
+            cache_path = os.path.join(cache_dir, f"features-{digest.hexdigest()[:16]}.pkl")
+            
+            if os.path.exists(cache_path):
+                with open(cache_path, 'rb') as f:
+                    cached = pickle.load(f)
+                self.vectorizer = cached['vectorizer']
+                print(f"Using cached features from {cache_path}")
+                lap('features_cached')
+                return cached['X'], cached['y']
+        
+        # Preprocess texts
+        processed_texts = self.preprocess_texts(df['text'], n_jobs)
+        lap('preprocess')
+        
+        # Create TF-IDF vectorizer
+        self.vectorizer = self.create_vectorizer()
+        
+        # Fit vectorizer and transform texts
+        X_text = self.vectorizer.fit_transform(processed_texts)
+        
+        # Combine text features with additional features (kept sparse)
+        X = self.combine_features(X_text, list(df['text']))
+        y = df['label']
+        lap('vectorize')
+        
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a temporary name first so a killed run leaves no truncated cache file
+            temporary_path = f"{cache_path}.{uuid.uuid4().hex[:8]}.tmp"
+            with open(temporary_path, 'wb') as f:
+                pickle.dump({'vectorizer': self.vectorizer, 'X': X, 'y': y}, f, protocol=5)
+            os.replace(temporary_path, cache_path)
+        
+        return X, y
+    
+    def preprocess_texts(self, texts, n_jobs=1):
+        """preprocess_text() over many texts, on a process pool for large inputs"""
+        from joblib import effective_n_jobs
+        
+        texts = list(texts)
+        workers = effective_n_jobs(n_jobs)
+        if workers <= 1 or len(texts) < PARALLEL_PREPROCESS_MIN_ROWS:
+            return [self.preprocess_text(text) for text in texts]
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(workers, initializer=_init_preprocess_worker, initargs=(self.tokenizer,)) as pool:
+            return list(pool.map(_preprocess_in_worker, texts, chunksize=max(1, len(texts) // (workers * 4))))
+    
+    def fit_linear_model(self, X_train, y_train):
+        """Fit the cheap first-stage model of the cascade on the same features"""
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import MaxAbsScaler
+        
+        # The handcrafted counts (text length in particular) are on a much larger
+        # scale than TF-IDF weights; MaxAbsScaler rescales without densifying
+        self.linear_model = make_pipeline(
+            MaxAbsScaler(),
+            LogisticRegression(C=1.0, max_iter=1000, class_weight='balanced')
+        )
+        self.linear_model.fit(X_train, y_train)
+    
+    def train_linear_model(self, csv_path=None):
+        """
+        Add the cascade's linear model to already trained RF/SVM models, using the
+        existing vectorizer and the same train/test split as train_models()
+        """
+        from sklearn.model_selection import train_test_split
+        
+        if not self.vectorizer:
+            raise ValueError("Models not trained. Please train models first.")
+        
+        df = self.load_dataset(csv_path)
+        X = self.build_features(list(df['text']))
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, df['label'], test_size=0.05, random_state=42, stratify=df['label']
+        )
+        
+        print("Training linear cascade model...")
+        self.fit_linear_model(X_train, y_train)
+        self.print_cascade_evaluation(X_test, y_test)
+        
+        self.set_model_version(f"{self.model_version}+linear-{uuid.uuid4().hex[:8]}")
+        return X_test, y_test
+    
+    def train_compressed_svm(self, csv_path=None, n_components=None, C=None):
+        """
+        Fit a CompressedSVM approximating the trained SVM, using the existing
+        vectorizer and the same train/test split as train_models(); prints and
+        returns the held-out accuracy delta and the scoring speedup
+        """
+        from sklearn.model_selection import train_test_split
+        from compressed_svm import CompressedSVM, SVM_COMPRESSED_COMPONENTS, SVM_COMPRESSED_C, svm_gamma
+        
+        if not self.vectorizer or self.svm_model is None:
+            raise ValueError("Models not trained. Please train models first.")
+        
+        df = self.load_dataset(csv_path)
+        X = self.build_features(list(df['text']))
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, df['label'], test_size=0.05, random_state=42, stratify=df['label']
+        )
+        
+        print("Training compressed SVM...")
+        self.svm_compressed = CompressedSVM.fit(
+            X_train, y_train, svm_gamma(self.svm_model),
+            n_components=n_components or SVM_COMPRESSED_COMPONENTS,
+            C=C or SVM_COMPRESSED_C
+        )
+        evaluation = self.print_svm_compression(X_test, y_test, X)
+        self.training_metrics = {**self.training_metrics, 'svm_compressed_accuracy': evaluation['compressed_accuracy']}
+        
+        self.set_model_version(f"{self.model_version}+svm-{uuid.uuid4().hex[:8]}")
+        return evaluation
+    
+    def evaluate_svm_compression(self, X_test, y_test, X_timing=None):
+        """
+        Held-out accuracy of the full and compressed SVMs (alone and in the
+        ensemble), their agreement, and predict_proba time per row when scoring
+        one row at a time and as one batch (over X_timing, default X_test)
+        """
+        y_test = np.asarray(y_test)
+        X_timing = X_test if X_timing is None else X_timing
+        full, compressed = self.svm_model, self.svm_compressed
+        full_predictions = full.predict(self.svm_input(X_test, full))
+        compressed_predictions = compressed.predict(X_test)
+        
+        def ensemble_accuracy(svm):
+            rf_prob = self.rf_model.predict_proba(X_test)
+            prob = (rf_prob + svm.predict_proba(self.svm_input(X_test, svm))) / 2
+            return float(np.mean(self.rf_model.classes_[np.argmax(prob, axis=1)] == y_test))
+        
+        def seconds_per_row(svm):
+            rows = min(X_timing.shape[0], 200)
+            start = time.perf_counter()
+            for row in range(rows):
+                svm.predict_proba(self.svm_input(X_timing[row:row + 1], svm))
+            single = (time.perf_counter() - start) / rows
+            start = time.perf_counter()
+            svm.predict_proba(self.svm_input(X_timing, svm))
+            return single, (time.perf_counter() - start) / X_timing.shape[0]
+        
+        full_single, full_batch = seconds_per_row(full)
+        compressed_single, compressed_batch = seconds_per_row(compressed)
+        full_accuracy = float(np.mean(full_predictions == y_test))
+        compressed_accuracy = float(np.mean(compressed_predictions == y_test))
+        return {
+            'rows': len(y_test),
+            'support_vectors': int(full.support_vectors_.shape[0]),
+            'landmarks': compressed.n_landmarks,
+            'full_accuracy': full_accuracy,
+            'compressed_accuracy': compressed_accuracy,
+            'accuracy_delta': compressed_accuracy - full_accuracy,
+            'agreement': float(np.mean(full_predictions == compressed_predictions)),
+            'full_ensemble_accuracy': ensemble_accuracy(full),
+            'compressed_ensemble_accuracy': ensemble_accuracy(compressed),
+            'single_row_speedup': full_single / compressed_single,
+            'batch_speedup': full_batch / compressed_batch
+        }
+    
+    def print_svm_compression(self, X_test, y_test, X_timing=None):
+        evaluation = self.evaluate_svm_compression(X_test, y_test, X_timing)
+        print(f"SVM: {evaluation['support_vectors']} support vectors -> {evaluation['landmarks']} landmarks")
+        print(f"Compressed SVM Accuracy: {evaluation['compressed_accuracy']:.3f} "
+              f"vs {evaluation['full_accuracy']:.3f} ({evaluation['accuracy_delta']:+.3f}), "
+              f"{evaluation['agreement']:.1%} agreement")
+        print(f"Ensemble Accuracy with compressed SVM: {evaluation['compressed_ensemble_accuracy']:.3f} "
+              f"vs {evaluation['full_ensemble_accuracy']:.3f}")
+        print(f"Compressed SVM speedup: {evaluation['single_row_speedup']:.1f}x per single row, "
+              f"{evaluation['batch_speedup']:.1f}x in a batch")
+        return evaluation
+    
+    def evaluate_cascade(self, X, y):
+        """Compare the cascade with the full ensemble on a labeled feature matrix"""
+        y = np.asarray(y)
+        ensemble_predictions = self._predict_ensemble(X, True)[0]
+        cascade_predictions, _, details = self._predict_cascade(X, count=False)
+        linear_predictions = self.linear_model.predict(X)
+        
+        return {
+            'rows': len(y),
+            'linear_fraction': float(np.mean(details['stage'] == 'linear')),
+            'ensemble_fraction': float(np.mean(details['stage'] == 'ensemble')),
+            'linear_accuracy': float(np.mean(linear_predictions == y)),
+            'ensemble_accuracy': float(np.mean(ensemble_predictions == y)),
+            'cascade_accuracy': float(np.mean(cascade_predictions == y)),
+            'agreement_with_ensemble': float(np.mean(cascade_predictions == ensemble_predictions))
+        }
+    
+    def print_cascade_evaluation(self, X_test, y_test):
+        evaluation = self.evaluate_cascade(X_test, y_test)
+        low, high = self.cascade_thresholds
+        print(f"Linear Model Accuracy: {evaluation['linear_accuracy']:.3f}")
+        print(f"Cascade ({low}, {high}) Accuracy: {evaluation['cascade_accuracy']:.3f} "
+              f"vs Ensemble {evaluation['ensemble_accuracy']:.3f}, "
+              f"{evaluation['linear_fraction']:.1%} decided by the linear stage")
+        return evaluation
+    
+    def timer(self, stage, rows=1):
+        """Context manager timing a stage into self.metrics (a no-op when metrics are off)"""
+        return stage_timer(self.metrics, stage, rows)
+    
+    def build_features(self, texts):
+        """Build the model input matrix (TF-IDF + handcrafted features) for a list of texts"""
+        with self.timer('preprocess', len(texts)):
+            processed_texts = [self.preprocess_text(text) for text in texts]
+        
+        # Vectorize all texts in one call
+        with self.timer('vectorize', len(texts)):
+            X_text = self.vectorizer.transform(processed_texts)
+        
+        return self.combine_features(X_text, texts)
+    
+    def combine_features(self, X_text, texts):
+        """Append the handcrafted features to a TF-IDF matrix, staying in CSR format and in its dtype"""
+        with self.timer('extract_features', len(texts)):
+            additional_features = np.array(
+                [list(self.extract_features(text).values()) for text in texts],
+                dtype=X_text.dtype
+            ).reshape(len(texts), -1)
+        
+        return sparse.hstack([X_text, sparse.csr_matrix(additional_features)], format='csr')
+    
+    def feature_dtype(self):
+        """dtype of the feature matrices: the fitted vectorizer's, else the configured one"""
+        return np.dtype(getattr(self.vectorizer, 'dtype', self.dtype))
+    
+    def svm_input(self, X, svm=None):
+        """SVMs fitted on dense arrays (older model files) cannot score sparse input"""
+        if getattr(svm or self.svm_model, '_sparse', True):
+            return X
+        return X.toarray()
+    
+    def active_svm(self):
+        """The SVM the ensemble scores with: the compressed one if selected and trained"""
+        if self.svm_variant == 'compressed' and self.svm_compressed is not None:
+            return self.svm_compressed
+        return self.svm_model
+    
+    def set_model_version(self, version):
+        """Record which model set is active; cached predictions from another set are dropped"""
+        if version != self.model_version and self.prediction_cache is not None:
+            self.prediction_cache.clear()
+        self.model_version = version
+    
     def predict(self, text, use_ensemble=True):
         """Predict if complaint is disaster-related"""
-        if not self.rf_model or not self.svm_model or not self.vectorizer:
-            raise ValueError("Models not trained. Please train models first.")
+        return self.predict_texts([text], use_ensemble)[0]
+    
+    def predict_texts(self, texts, use_ensemble=True):
+        """
+        predict() for a list of complaints: a (prediction, confidence, details)
+        tuple per text, answered from the prediction cache where possible and
+        with one predict_batch() call for the rest
+        """
+        results = [None] * len(texts)
+        cache_keys = {}
+        if self.prediction_cache is not None:
+            for index, text in enumerate(texts):
+                if not isinstance(text, str):
+                    continue
+                cache_key = self.prediction_cache.key(text, self.model_version, use_ensemble, self.cascade and self.cascade_thresholds,
+                                                         self.svm_variant)
+                cached = self.prediction_cache.get(cache_key)
+                if cached is not None:
+                    prediction, confidence, details = cached
+                    results[index] = prediction, confidence, dict(details)
+                else:
+                    cache_keys[index] = cache_key
         
-        # Preprocess text
-        processed_text = self.preprocess_text(text)
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            predictions, confidences, details = self.predict_batch([texts[index] for index in missing], use_ensemble)
+            for row, index in enumerate(missing):
+                result = predictions[row], confidences[row], {key: values[row] for key, values in details.items()}
+                results[index] = result
+                if index in cache_keys:
+                    self.prediction_cache.set(cache_keys[index], (result[0], result[1], dict(result[2])))
         
-        # Vectorize text
-        X_text = self.vectorizer.transform([processed_text])
+        return results
+    
+    def predict_batch(self, texts, use_ensemble=True):
+        """
+        Predict a list of complaints with one vectorized call per model
+        Returns arrays of predictions and confidences plus a dict of per-model
+        arrays, row for row identical to calling predict() on each text
+        """
+        if not self.vectorizer or (not self.has_ensemble() and self.linear_model is None):
+            raise ValueError("Models not trained. Please train models first.")
         
-        # Extract additional features
-        features = self.extract_features(text)
-        additional_features = np.array([list(features.values())])
+        texts = list(texts)
+        if not texts:
+            return np.array([], dtype=object), np.array([]), {}
         
-        # Combine features
-        X = np.hstack([X_text.toarray(), additional_features])
+        with self.timer('predict_batch', len(texts)):
+            return self.predict_features(self.build_features(texts), use_ensemble)
+    
+    def predict_features(self, X, use_ensemble=True):
+        """Score a feature matrix from build_features(); same return values as predict_batch()"""
+        if not self.has_ensemble():
+            # Incrementally trained models have only the linear model
+            with self.timer('linear', X.shape[0]):
+                linear_prob = self.linear_model.predict_proba(X)
+            return self.linear_model.classes_[np.argmax(linear_prob, axis=1)], np.max(linear_prob, axis=1), {}
+        if use_ensemble and self.cascade and self.linear_model is not None:
+            return self._predict_cascade(X)
+        return self._predict_ensemble(X, use_ensemble)
+    
+    def has_ensemble(self):
+        return self.rf_model is not None and self.svm_model is not None
+    
+    def compile_forest(self):
+        """
+        Replace the random forest with a CompactForest (see compact_forest.py):
+        same probabilities, faster scoring and a smaller bundle. The sklearn
+        forest is gone afterwards, so compile after training and evaluation.
+        """
+        from compact_forest import CompactForest
+        
+        if self.rf_model is None:
+            raise ValueError("Models not trained. Please train models first.")
+        if not isinstance(self.rf_model, CompactForest):
+            self.rf_model = CompactForest.from_forest(self.rf_model, dtype=self.feature_dtype())
+        return self.rf_model
+    
+    def _predict_ensemble(self, X, use_ensemble):
+        # Each model runs predict_proba once; its label is the argmax of those
+        # probabilities, so the per-model details agree with the confidences
+        # (SVC.predict can disagree with its Platt-scaled predict_proba)
+        rows = X.shape[0]
+        with self.timer('rf', rows):
+            rf_prob = self.rf_model.predict_proba(X)
+        rf_best = np.argmax(rf_prob, axis=1)
+        rf_predictions = self.rf_model.classes_[rf_best]
+        rf_confidences = rf_prob[np.arange(len(rf_best)), rf_best]
         
         if use_ensemble:
             # Ensemble prediction (average of both models)
-            rf_prob = self.rf_model.predict_proba(X)[0]
-            svm_prob = self.svm_model.predict_proba(X)[0]
+            svm = self.active_svm()
+            with self.timer('svm', rows):
+                svm_prob = svm.predict_proba(self.svm_input(X, svm))
+            svm_best = np.argmax(svm_prob, axis=1)
             
             # Average probabilities
             avg_prob = (rf_prob + svm_prob) / 2
             
             # Get class with highest probability
             classes = self.rf_model.classes_
-            prediction = classes[np.argmax(avg_prob)]
-            confidence = np.max(avg_prob)
+            predictions = classes[np.argmax(avg_prob, axis=1)]
+            confidences = np.max(avg_prob, axis=1)
             
-            return prediction, confidence, {
-                'rf_prediction': self.rf_model.predict(X)[0],
-                'svm_prediction': self.svm_model.predict(X)[0],
-                'rf_confidence': np.max(rf_prob),
-                'svm_confidence': np.max(svm_prob)
+            return predictions, confidences, {
+                'rf_prediction': rf_predictions,
+                'svm_prediction': svm.classes_[svm_best],
+                'rf_confidence': rf_confidences,
+                'svm_confidence': svm_prob[np.arange(len(svm_best)), svm_best]
             }
         else:
             # Use Random Forest as primary
-            prediction = self.rf_model.predict(X)[0]
-            confidence = np.max(self.rf_model.predict_proba(X)[0])
-            return prediction, confidence, {}
+            return rf_predictions, rf_confidences, {}
     
-    def save_models(self, model_dir):
-        """Save trained models to disk"""
+    def _predict_cascade(self, X, count=True):
+        """Linear model first; rows inside the uncertain band are re-scored by the ensemble"""
+        with self.timer('linear', X.shape[0]):
+            linear_prob = self.linear_model.predict_proba(X)
+        classes = self.linear_model.classes_
+        verified_prob = linear_prob[:, list(classes).index('verified')]
+        
+        low, high = self.cascade_thresholds
+        uncertain = (verified_prob > low) & (verified_prob < high)
+        
+        predictions = classes[np.argmax(linear_prob, axis=1)].astype(object)
+        confidences = np.max(linear_prob, axis=1)
+        rows = X.shape[0]
+        details = {
+            'stage': np.where(uncertain, 'ensemble', 'linear').astype(object),
+            'linear_confidence': confidences.copy(),
+            # Per-model outputs only exist for rows the ensemble scored
+            'rf_prediction': np.full(rows, None, dtype=object),
+            'svm_prediction': np.full(rows, None, dtype=object),
+            'rf_confidence': np.full(rows, None, dtype=object),
+            'svm_confidence': np.full(rows, None, dtype=object)
+        }
+        
+        if uncertain.any():
+            ensemble_predictions, ensemble_confidences, ensemble_details = self._predict_ensemble(X[uncertain], True)
+            predictions[uncertain] = ensemble_predictions
+            confidences[uncertain] = ensemble_confidences
+            for key, values in ensemble_details.items():
+                details[key][uncertain] = values
+        
+        if count:
+            escalated = int(uncertain.sum())
+            self.cascade_counts['ensemble'] += escalated
+            self.cascade_counts['linear'] += rows - escalated
+        
+        return predictions, confidences, details
+    
+    def cascade_stats(self):
+        """Fraction of cascade traffic each stage has handled so far"""
+        total = sum(self.cascade_counts.values())
+        return {
+            'enabled': self.cascade and self.linear_model is not None and self.has_ensemble(),
+            'thresholds': list(self.cascade_thresholds),
+            **self.cascade_counts,
+            'linear_fraction': self.cascade_counts['linear'] / total if total else 0.0
+        }
+    
+    def save_models(self, model_dir, model_format='bundle'):
+        """
+        Save trained models to disk
+        'bundle' writes the memory-mappable bundle (see BUNDLE_*), 'legacy'
+        writes the original three pickles. Every file is written under a
+        temporary name and renamed into place, so processes that memory-mapped
+        the previous bundle keep reading it unchanged. Files of the other
+        layout, and optional model files not written this time, are removed.
+        """
+        if model_format not in MODEL_FORMATS:
+            raise ValueError(f"Unknown model format '{model_format}', expected one of {MODEL_FORMATS}")
+        
         os.makedirs(model_dir, exist_ok=True)
         
-        with open(os.path.join(model_dir, 'rf_model.pkl'), 'wb') as f:
-            pickle.dump(self.rf_model, f)
+        # Models saved directly into model_dir replace any published version
+        current_path = os.path.join(model_dir, CURRENT_VERSION_FILE)
+        if os.path.exists(current_path):
+            os.remove(current_path)
         
-        with open(os.path.join(model_dir, 'svm_model.pkl'), 'wb') as f:
-            pickle.dump(self.svm_model, f)
+        if model_format == 'legacy':
+            written = []
+            for file_name, model in (('rf_model.pkl', self.rf_model), ('svm_model.pkl', self.svm_model),
+                                     ('vectorizer.pkl', self.vectorizer), (LINEAR_MODEL_FILE, self.linear_model),
+                                     (SVM_COMPRESSED_FILE, self.svm_compressed)):
+                # The linear model and the compressed SVM are optional
+                if model is None and file_name in (LINEAR_MODEL_FILE, SVM_COMPRESSED_FILE):
+                    continue
+                with open_atomic(os.path.join(model_dir, file_name)) as f:
+                    pickle.dump(model, f)
+                written.append(file_name)
+        else:
+            import sklearn
+            
+            models = {
+                'rf_model': self.rf_model,
+                'svm_model': self.svm_model,
+                'vectorizer': self.vectorizer,
+                'linear_model': self.linear_model,
+                'svm_compressed': self.svm_compressed
+            }
+            buffers = []
+            graph = pickle.dumps(models, protocol=5, buffer_callback=buffers.append)
+            
+            digest = hashlib.sha256(graph)
+            layout = []
+            offset = 0
+            with open_atomic(os.path.join(model_dir, BUNDLE_DATA_FILE)) as f:
+                for buffer in buffers:
+                    data = buffer.raw()
+                    padding = -offset % BUNDLE_ALIGNMENT
+                    f.write(b'\0' * padding)
+                    offset += padding
+                    layout.append([offset, data.nbytes])
+                    f.write(data)
+                    digest.update(data)
+                    offset += data.nbytes
+            
+            with open_atomic(os.path.join(model_dir, BUNDLE_GRAPH_FILE)) as f:
+                f.write(graph)
+            
+            # Written last: read_models() looks for the metadata to detect a bundle
+            with open_atomic(os.path.join(model_dir, BUNDLE_METADATA_FILE), 'w') as f:
+                json.dump({
+                    'format_version': BUNDLE_FORMAT_VERSION,
+                    'digest': digest.hexdigest()[:16],
+                    'sklearn_version': sklearn.__version__,
+                    'numpy_version': np.__version__,
+                    'supports_updates': self.supports_updates(),
+                    'buffers': layout
+                }, f, indent=2)
+            written = BUNDLE_FILES
         
-        with open(os.path.join(model_dir, 'vectorizer.pkl'), 'wb') as f:
-            pickle.dump(self.vectorizer, f)
+        # A leftover bundle would shadow a legacy save, and stale optional
+        # pickles would load next to the new estimators
+        for file_name in BUNDLE_FILES + LEGACY_FILES:
+            if file_name not in written and os.path.exists(os.path.join(model_dir, file_name)):
+                os.remove(os.path.join(model_dir, file_name))
         
         print(f"Models saved to {model_dir}")
     
-    def load_models(self, model_dir):
-        """Load trained models from disk"""
+    def publish_models(self, model_dir, model_format='bundle'):
+        """
+        Save the models as a new immutable version in the model registry under
+        model_dir and make it the current one (see model_registry.py).
+        Readers see either the old or the new version, never a partly written one.
+        Returns the version name.
+        """
+        version = ModelRegistry(model_dir).publish(self, model_format)
+        print(f"Published model version {version}")
+        return version
+    
+    def feature_schema(self, vectorizer=None):
+        """
+        Hash and width of the feature layout the models expect: preprocessing
+        version, vectorizer configuration and vocabulary, handcrafted features
+        """
+        vectorizer = vectorizer or self.vectorizer
+        vocabulary = getattr(vectorizer, 'vocabulary_', None)
+        width = len(vocabulary) if vocabulary is not None else vectorizer.n_features
+        handcrafted = list(self.extract_features(''))
+        
+        schema = json.dumps({
+            'version': FEATURE_CACHE_VERSION,
+            'vectorizer': type(vectorizer).__name__,
+            'params': repr(sorted(vectorizer.get_params().items())),
+            'vocabulary': sorted((term, int(index)) for term, index in vocabulary.items()) if vocabulary else None,
+            'handcrafted': handcrafted,
+            'keywords': [self.disaster_keywords, self.urgency_words, self.keyword_matcher.word_boundary]
+        })
+        return {
+            'hash': hashlib.sha256(schema.encode('utf-8')).hexdigest()[:16],
+            'n_features': width + len(handcrafted)
+        }
+    
+    def check_models(self, models, feature_schema=None):
+        """Raise ValueError if the estimators do not fit the vectorizer's features"""
+        schema = self.feature_schema(models['vectorizer'])
+        if feature_schema is not None and feature_schema['hash'] != schema['hash']:
+            raise ValueError(f"Feature schema {schema['hash']} does not match the published {feature_schema['hash']}")
+        
+        for name in ('rf_model', 'svm_model', 'linear_model', 'svm_compressed'):
+            expected = getattr(models.get(name), 'n_features_in_', None)
+            if expected is not None and expected != schema['n_features']:
+                raise ValueError(f"{name} expects {expected} features but the vectorizer produces {schema['n_features']}")
+    
+    def reload_if_changed(self, interval=0.0):
+        """
+        Hot-swap to the registry's current version if it changed since the last
+        load, checking at most once per `interval` seconds. The swap happens
+        between requests in the calling thread; if the new version is rejected
+        the loaded models stay. Returns True if new models were loaded.
+        Status messages go to stderr: in serve mode stdout carries the responses.
+        """
+        if self.model_dir is None:
+            return False
+        
+        now = time.monotonic()
+        if now - self.last_reload_check < interval:
+            return False
+        self.last_reload_check = now
+        
+        current = ModelRegistry(self.model_dir).current_version()
+        if current is None or current == self.registry_version:
+            return False
+        with redirect_stdout(sys.stderr):
+            return self.load_models(self.model_dir)
+    
+    def load_models(self, model_dir, memory_map=True):
+        """
+        Load trained models from disk
+        The registry's current version (see publish_models) is loaded if there
+        is one, after checking its files against the manifest. Otherwise a model
+        bundle is preferred when present (memory-mapped unless memory_map=False),
+        then the legacy three-pickle layout. Models whose estimators do not match
+        the vectorizer are rejected, keeping the models already loaded.
+        """
+        registry = ModelRegistry(model_dir)
+        version = registry.current_version()
+        feature_schema = None
+        source_dir = model_dir
+        if version is not None:
+            try:
+                feature_schema = registry.verify(version)['feature_schema']
+            except (ValueError, OSError) as e:
+                print(f"Rejected model version {version}: {e}")
+                return False
+            source_dir = registry.version_dir(version)
+        
+        with self.timer('load_models'):
+            loaded = self.read_models(source_dir, memory_map)
+        if loaded is None:
+            return False
+        models, digest = loaded
+        
+        try:
+            self.check_models(models, feature_schema)
+        except ValueError as e:
+            print(f"Rejected models in {source_dir}: {e}")
+            return False
+        
+        self.rf_model = models['rf_model']
+        self.svm_model = models['svm_model']
+        self.vectorizer = models['vectorizer']
+        self.linear_model = models['linear_model']
+        self.svm_compressed = models['svm_compressed']
+        if self.svm_variant == 'compressed' and self.svm_compressed is None:
+            print(f"No compressed SVM in {source_dir}, scoring with the full SVM")
+        self.set_model_version(digest)
+        self.model_dir = model_dir
+        self.registry_version = version
+        return True
+    
+    def read_models(self, model_dir, memory_map=True):
+        """Read the models in model_dir; returns (models dict, content digest), or None if missing"""
+        if os.path.exists(os.path.join(model_dir, BUNDLE_METADATA_FILE)):
+            return self._read_bundle(model_dir, memory_map)
+        
         try:
-            with open(os.path.join(model_dir, 'rf_model.pkl'), 'rb') as f:
-                self.rf_model = pickle.load(f)
+            # The model version is a digest of the files, so reloading the same
+            # models keeps the prediction cache and loading new ones clears it
+            digest = hashlib.sha256()
+            models = {}
+            for name in ('rf_model', 'svm_model', 'vectorizer'):
+                with open(os.path.join(model_dir, f'{name}.pkl'), 'rb') as f:
+                    data = f.read()
+                digest.update(data)
+                models[name] = pickle.loads(data)
             
-            with open(os.path.join(model_dir, 'svm_model.pkl'), 'rb') as f:
-                self.svm_model = pickle.load(f)
-            
-            with open(os.path.join(model_dir, 'vectorizer.pkl'), 'rb') as f:
-                self.vectorizer = pickle.load(f)
+            # The cascade's linear model and the compressed SVM are optional in the legacy layout
+            for name, file_name in (('linear_model', LINEAR_MODEL_FILE), ('svm_compressed', SVM_COMPRESSED_FILE)):
+                models[name] = None
+                path = os.path.join(model_dir, file_name)
+                if os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                    digest.update(data)
+                    models[name] = pickle.loads(data)
             
             print(f"Models loaded from {model_dir}")
-            return True
+            return models, digest.hexdigest()[:16]
         except FileNotFoundError:
             print(f"Model files not found in {model_dir}")
-            return False
+            return None
+    
+    def _read_bundle(self, model_dir, memory_map):
+        with open(os.path.join(model_dir, BUNDLE_METADATA_FILE)) as f:
+            metadata = json.load(f)
+        
+        if metadata.get('format_version') != BUNDLE_FORMAT_VERSION:
+            print(f"Unsupported model bundle version {metadata.get('format_version')} in {model_dir}")
+            return None
+        
+        try:
+            with open(os.path.join(model_dir, BUNDLE_GRAPH_FILE), 'rb') as f:
+                graph = f.read()
+            with open(os.path.join(model_dir, BUNDLE_DATA_FILE), 'rb') as f:
+                if memory_map and os.fstat(f.fileno()).st_size:
+                    # Copy-on-write mapping: pages stay shared with other processes mapping
+                    # the same file, but arrays are writable, which libsvm requires
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                else:
+                    data = bytearray(f.read())
+        except FileNotFoundError:
+            print(f"Model bundle files not found in {model_dir}")
+            return None
+        
+        # Arrays are rebuilt directly on top of the mapped file, without copying
+        view = memoryview(data)
+        bundle = pickle.loads(graph, buffers=[view[start:start + size] for start, size in metadata['buffers']])
+        bundle.setdefault('linear_model', None)
+        bundle.setdefault('svm_compressed', None)
+        
+        print(f"Models loaded from {model_dir} (bundle{', memory-mapped' if memory_map else ''})")
+        return bundle, metadata['digest']
+
+# Prediction cache used by --serve: entries, and seconds before an entry expires
+SERVE_CACHE_SIZE = 10000
+SERVE_CACHE_TTL = 3600
+SERVE_QUEUE_SIZE = 64
+SERVE_MAX_WAIT_MS = 5.0
+# Seconds between checks of the model registry for a new current version
+SERVE_RELOAD_INTERVAL = 5.0
+BULK_CHUNK_SIZE = 1000
+# How often --metrics-file is rewritten while serving
+SERVE_METRICS_INTERVAL = 15.0
+
+def handle_request(classifier, request):
+    """Classify one serve-mode request and build its JSON response"""
+    response = {}
+    if 'id' in request:
+        response['id'] = request['id']
+    
+    if request.get('cmd') == 'stats':
+        response['stats'] = classifier_stats(classifier)
+        return response
+    
+    # {"cmd": "metrics", "format": "json"|"prometheus"} exports the stage latency histograms
+    if request.get('cmd') == 'metrics':
+        if classifier.metrics is None:
+            response['error'] = "Metrics are disabled, start the server with --metrics"
+            return response
+        try:
+            response['metrics'] = classifier.metrics.export(request.get('format', 'json'))
+        except ValueError as e:
+            response['error'] = str(e)
+        return response
+    
+    # New published models are picked up between requests; {"cmd": "reload"} checks right away
+    if request.get('cmd') == 'reload':
+        response['reloaded'] = classifier.reload_if_changed()
+        response['model_version'] = classifier.model_version
+        return response
+    classifier.reload_if_changed(SERVE_RELOAD_INTERVAL)
+    
+    try:
+        add_prediction(response, request, classifier.predict(request.get('text', '')))
+    except Exception as e:
+        # Same fallback as the one-shot CLI: never auto-verify on error
+        response['result'] = 'not_verified'
+        response['error'] = str(e)
+    
+    return response
+
+def add_prediction(response, request, result):
+    """Fill a serve-mode response from a (prediction, confidence, details) tuple"""
+    prediction, confidence, details = result
+    response['result'] = prediction
+    response['confidence'] = round(float(confidence), 3)
+    if request.get('verbose') and details:
+        response['details'] = {
+            key: round(float(value), 3) if isinstance(value, (float, np.floating)) else value
+            for key, value in details.items()
+        }
+    return response
+
+def classifier_stats(classifier):
+    """Runtime counters reported by the serve-mode stats command"""
+    stats = {
+        'model_version': classifier.model_version,
+        'registry_version': classifier.registry_version,
+        'stem_cache': classifier.stem_cache_stats(),
+        'cascade': classifier.cascade_stats(),
+        'svm': classifier.svm_variant if classifier.svm_compressed is not None else 'full',
+        'dtype': str(classifier.feature_dtype())
+    }
+    if classifier.prediction_cache is not None:
+        stats['prediction_cache'] = classifier.prediction_cache.stats()
+    return stats
+
+def serve(classifier, input_stream=None, output_stream=None):
+    """
+    Long-running mode: answer JSON-lines requests until EOF
+    Each input line is {"id": ..., "text": ...} (or plain complaint text) and
+    each output line is {"id": ..., "result": "verified"|"not_verified", ...}
+    {"cmd": "stats"} returns the cache counters instead, {"cmd": "metrics"} the
+    stage latency histograms
+    """
+    output_stream = output_stream or sys.stdout
+    
+    for request in read_requests(input_stream or sys.stdin):
+        response = handle_request(classifier, request)
+        output_stream.write(json.dumps(response) + '\n')
+        output_stream.flush()
+
+def read_requests(input_stream):
+    """Parse serve-mode input lines into request dicts"""
+    # readline() instead of iteration so each request is answered as soon as it arrives
+    for line in iter(input_stream.readline, ''):
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if not isinstance(request, dict):
+            request = {'text': line}
+        yield request
+
+def serve_batched(classifier, max_batch, max_wait_ms, input_stream=None, output_stream=None):
+    """
+    serve() with requests scored in micro-batches
+    Lines are handed to a MicroBatcher as they arrive, and a writer thread
+    answers them in request order as their batches finish
+    """
+    output_stream = output_stream or sys.stdout
+    pending = queue.Queue()
+    
+    # Batches are scored on the batcher's thread and commands answered on the
+    # writer's, so a model reload must not run while a batch is being scored
+    model_lock = threading.Lock()
+    
+    def score_batch(texts):
+        with model_lock:
+            classifier.reload_if_changed(SERVE_RELOAD_INTERVAL)
+            return classifier.predict_texts(texts)
+    
+    batcher = MicroBatcher(score_batch, max_batch, max_wait_ms)
+    
+    def write_responses():
+        for request, future in iter(pending.get, None):
+            if future is None:
+                with model_lock:
+                    response = handle_request(classifier, request)
+                if 'stats' in response:
+                    response['stats']['batching'] = batcher.stats()
+            else:
+                response = {'id': request['id']} if 'id' in request else {}
+                try:
+                    add_prediction(response, request, future.result())
+                except Exception as e:
+                    # Same fallback as the one-shot CLI: never auto-verify on error
+                    response['result'] = 'not_verified'
+                    response['error'] = str(e)
+            output_stream.write(json.dumps(response) + '\n')
+            output_stream.flush()
+    
+    writer = threading.Thread(target=write_responses, daemon=True)
+    writer.start()
+    
+    for request in read_requests(input_stream or sys.stdin):
+        if request.get('cmd') in ('stats', 'reload', 'metrics'):
+            pending.put((request, None))
+        else:
+            pending.put((request, batcher.submit(request.get('text', ''))))
+    
+    pending.put(None)
+    writer.join()
+    batcher.close()
+
+def serve_pool(pool, input_stream=None, output_stream=None):
+    """
+    serve() across a started WorkerPool
+    Responses are written in request order, as in single-process mode;
+    stats requests report the counters of the worker that answered them
+    """
+    output_stream = output_stream or sys.stdout
+    total = None
+    
+    def write_responses():
+        finished = {}
+        next_sequence = 0
+        while total is None or next_sequence < total:
+            try:
+                sequence, response = pool.get_result(timeout=0.1)
+            except queue.Empty:
+                continue
+            finished[sequence] = response
+            while next_sequence in finished:
+                output_stream.write(json.dumps(finished.pop(next_sequence)) + '\n')
+                next_sequence += 1
+            output_stream.flush()
+    
+    writer = threading.Thread(target=write_responses, daemon=True)
+    writer.start()
+    
+    for request in read_requests(input_stream or sys.stdin):
+        pool.submit(request)
+    
+    total = pool.submitted
+    writer.join()
+    pool.close()
+
+def write_metrics_file(metrics, path, interval=SERVE_METRICS_INTERVAL):
+    """
+    Rewrite path with the stage metrics every interval seconds from a daemon
+    thread (Prometheus text, or a JSON snapshot for a .json path)
+    Returns a function that writes the file once more, for shutdown
+    """
+    metrics_format = 'json' if path.endswith('.json') else 'prometheus'
+    
+    def write():
+        exported = metrics.export(metrics_format)
+        write_atomic(path, exported if metrics_format == 'prometheus' else json.dumps(exported))
+    
+    def run():
+        while True:
+            time.sleep(interval)
+            write()
+    
+    threading.Thread(target=run, daemon=True).start()
+    return write
+
+def load_or_train(classifier, model_dir):
+    """Load saved models, training new ones if none exist"""
+    if not classifier.load_models(model_dir):
+        print("No trained models found. Training new models...")
+        classifier.train_models()
+        classifier.publish_models(model_dir)
 
 def main():
     """Main function for command line usage"""
+    # --profile[=report.txt] works with every mode below; profiling (cProfile,
+    # pstats, tracemalloc) is only imported when it is asked for
+    profile_report = None
+    if any(arg.startswith('--profile') for arg in sys.argv[1:]):
+        from profiling import pop_profile_option
+        
+        profile_report = pop_profile_option(sys.argv)
+    if profile_report is None:
+        return run_cli()
+    
+    from profiling import RunProfiler
+    
+    with RunProfiler(profile_report):
+        return run_cli()
+
+def run_cli():
     if len(sys.argv) < 2:
-        print("Usage: python disaster_classifier.py <complaint_text> [train]")
+        print("Usage: python disaster_classifier.py <complaint_text> [train|verbose] [--profile[=REPORT]]")
+        print("       python disaster_classifier.py --serve [--cascade] [--compressed-svm] [--workers N]")
+        print("                                                [--queue-size N] [--max-batch N] [--max-wait-ms MS]")
+        print("                                                [--metrics] [--metrics-file PATH]")
+        print("       python disaster_classifier.py --classify-file <input.csv|jsonl> <output.csv|jsonl> [--resume]")
         sys.exit(1)
     
-    # Initialize classifier
-    classifier = DisasterClassifier()
+    # Initialize classifier; verbose runs also report where the time went
+    verbose = len(sys.argv) > 2 and sys.argv[2] == 'verbose'
+    classifier = DisasterClassifier(metrics=verbose)
     
     # Get current script directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     model_dir = os.path.join(script_dir, 'models')
     
+    # Long-running mode: load models once, then read requests from stdin
+    if sys.argv[1] == '--serve':
+        import argparse
+        
+        parser = argparse.ArgumentParser(prog='disaster_classifier.py --serve')
+        # --cascade lets the linear model answer the confident cases (if one was trained)
+        parser.add_argument('--cascade', action='store_true')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='forked worker processes sharing the loaded models')
+        parser.add_argument('--queue-size', type=int, default=SERVE_QUEUE_SIZE,
+                            help='requests waiting for a worker before input reading blocks')
+        parser.add_argument('--max-batch', type=int, default=1,
+                            help='score up to this many concurrent requests in one batch call')
+        parser.add_argument('--max-wait-ms', type=float, default=SERVE_MAX_WAIT_MS,
+                            help='how long a batch waits for more requests after its first one')
+        parser.add_argument('--compressed-svm', action='store_true',
+                            help='score with the compressed SVM, if the models include one')
+        parser.add_argument('--metrics', action='store_true',
+                            help='record per-stage latency histograms ({"cmd": "metrics"} exports them)')
+        parser.add_argument('--metrics-file',
+                            help='also write the metrics to this file periodically (Prometheus text, or JSON for .json)')
+        options = parser.parse_args(sys.argv[2:])
+        if options.workers > 1 and options.max_batch > 1:
+            parser.error("--max-batch is not supported together with --workers")
+        if options.workers > 1 and options.metrics_file:
+            # Every worker records into its own copy of the histograms
+            parser.error("--metrics-file is not supported together with --workers")
+        
+        # Repeated complaint texts are answered from the prediction cache
+        classifier = DisasterClassifier(
+            cache_size=SERVE_CACHE_SIZE,
+            cache_ttl=SERVE_CACHE_TTL,
+            cascade=options.cascade,
+            svm_variant='compressed' if options.compressed_svm else 'full',
+            metrics=options.metrics or bool(options.metrics_file)
+        )
+        # stdout carries the JSON-lines protocol, so status messages go to stderr
+        with redirect_stdout(sys.stderr):
+            load_or_train(classifier, model_dir)
+        
+        write_metrics = None
+        if options.metrics_file:
+            write_metrics = write_metrics_file(classifier.metrics, options.metrics_file)
+        
+        if options.workers > 1:
+            pool = WorkerPool(classifier, handle_request, options.workers, options.queue_size).start()
+            print(f"Classifier ready ({options.workers} workers)", file=sys.stderr)
+            serve_pool(pool)
+        elif options.max_batch > 1:
+            print(f"Classifier ready (batches of up to {options.max_batch})", file=sys.stderr)
+            serve_batched(classifier, options.max_batch, options.max_wait_ms)
+        else:
+            print("Classifier ready", file=sys.stderr)
+            serve(classifier)
+        
+        if write_metrics is not None:
+            write_metrics()
+        return
+    
+    # Bulk mode: stream a CSV/JSONL file through predict_batch() in chunks
+    if sys.argv[1] == '--classify-file':
+        import argparse
+        from bulk_classify import classify_file
+        
+        parser = argparse.ArgumentParser(prog='disaster_classifier.py --classify-file')
+        parser.add_argument('input')
+        parser.add_argument('output')
+        parser.add_argument('--text-field', default='text')
+        parser.add_argument('--id-field', help='input field copied to each output row')
+        parser.add_argument('--chunk-size', type=int, default=BULK_CHUNK_SIZE)
+        parser.add_argument('--start-row', type=int, default=0, help='skip this many input rows')
+        parser.add_argument('--resume', action='store_true',
+                            help='append to the output, continuing after its last complete row')
+        options = parser.parse_args(sys.argv[2:])
+        
+        load_or_train(classifier, model_dir)
+        classified = classify_file(
+            classifier, options.input, options.output,
+            text_field=options.text_field,
+            id_field=options.id_field,
+            chunk_size=options.chunk_size,
+            start_row=options.start_row,
+            resume=options.resume
+        )
+        print(f"Classified {classified} rows into {options.output}")
+        return
+    
     # Check if we need to train
     if len(sys.argv) > 2 and sys.argv[2] == 'train':
         print("Training models...")
         classifier.train_models()
-        classifier.save_models(model_dir)
+        classifier.publish_models(model_dir)
         print("Training completed!")
         return
     
     # Try to load existing models
-    if not classifier.load_models(model_dir):
-        print("No trained models found. Training new models...")
-        classifier.train_models()
-        classifier.save_models(model_dir)
+    load_or_train(classifier, model_dir)
     
     # Get complaint text from command line
     complaint_text = sys.argv[1]
@@ -381,12 +1608,14 @@ def main():
         print(prediction)
         
         # Optional: Print detailed results to stderr for debugging
-        if len(sys.argv) > 2 and sys.argv[2] == 'verbose':
+        if verbose:
             print(f"Prediction: {prediction}", file=sys.stderr)
             print(f"Confidence: {confidence:.3f}", file=sys.stderr)
             if details:
                 print(f"RF Prediction: {details.get('rf_prediction', 'N/A')}", file=sys.stderr)
                 print(f"SVM Prediction: {details.get('svm_prediction', 'N/A')}", file=sys.stderr)
+            for stage, summary in classifier.metrics.snapshot()['stages'].items():
+                print(f"{stage:>16}: {summary['total_ms']:8.2f} ms", file=sys.stderr)
     
     except Exception as e:
         print(f"Error during prediction: {e}", file=sys.stderr)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Online feedback loop for the disaster classifier
+Labels from admin manual verification are appended to a training log and
+applied to the partial_fit model (see train_incremental) without a full
+retrain; the updated models are published as a new model version, and
+versions beyond the newest FEEDBACK_KEEP_VERSIONS are pruned.
+
+Usage:
+    python feedback.py "<complaint text>" verified|not_verified
+    python feedback.py < corrections.jsonl      # {"text": ..., "label": ...} per line
+Prints one JSON line with what was logged, updated and published.
+"""
+
+import sys
+import os
+import json
+import time
+import pickle
+from contextlib import contextmanager, redirect_stdout
+from model_registry import ModelRegistry
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+FEEDBACK_LOG_FILE = 'feedback_log.jsonl'
+FEEDBACK_LOCK_FILE = 'feedback.lock'
+# Every applied correction publishes a version (~6 MB with the hashing model);
+# older ones are deleted after each publish so disk use stays bounded
+FEEDBACK_KEEP_VERSIONS = 10
+NO_UPDATES_REASON = "active model has no partial_fit; retrain with train_incremental() to enable updates"
+
+LABELS = {
+    'verified': 'verified', 'not_verified': 'not_verified',
+    '1': 'verified', '0': 'not_verified',
+    'true': 'verified', 'false': 'not_verified'
+}
+
+
+def normalize_label(label):
+    """'verified' / 'not_verified' from a label, 1/0 or a boolean"""
+    normalized = LABELS.get(str(label).strip().lower())
+    if normalized is None:
+        raise ValueError(f"Unknown label {label!r}, expected verified or not_verified")
+    return normalized
+
+
+class FeedbackLog:
+    """
+    Append-only JSON-lines log of labeled complaints
+    Every correction is kept, so the next full or incremental retrain can
+    include them even if applying them to the live model failed
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def append(self, pairs):
+        now = time.time()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for text, label in pairs:
+                f.write(json.dumps({'text': text, 'label': label, 'time': round(now, 3)}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def __iter__(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    yield entry['text'], entry['label']
+
+
+def log_feedback(pairs, model_dir, log=None):
+    """Append labeled (text, label) pairs to the feedback log; returns them with normalized labels"""
+    pairs = [(text, normalize_label(label)) for text, label in pairs]
+    log = log or FeedbackLog(os.path.join(model_dir, FEEDBACK_LOG_FILE))
+    log.append(pairs)
+    return pairs
+
+
+def updates_supported(model_dir):
+    """
+    Whether the active models can learn online, decided without loading them:
+    from the current registry version's manifest or, without a registry, from
+    the bundle metadata or the legacy linear_model.pkl (the only pickle read).
+    None if unknown
+    """
+    from disaster_classifier import BUNDLE_METADATA_FILE, LINEAR_MODEL_FILE
+
+    registry = ModelRegistry(model_dir)
+    version = registry.current_version()
+    if version is not None:
+        try:
+            return registry.manifest(version).get('supports_updates')
+        except (OSError, ValueError):
+            return None
+
+    bundle_metadata = os.path.join(model_dir, BUNDLE_METADATA_FILE)
+    linear_model = os.path.join(model_dir, LINEAR_MODEL_FILE)
+    try:
+        if os.path.exists(bundle_metadata):
+            with open(bundle_metadata) as f:
+                return json.load(f).get('supports_updates')
+        if not os.path.exists(os.path.join(model_dir, 'vectorizer.pkl')):
+            # No models at all; loading them reports the error
+            return None
+        if not os.path.exists(linear_model):
+            return False
+        with open(linear_model, 'rb') as f:
+            return hasattr(pickle.load(f)[-1], 'partial_fit')
+    except Exception:
+        return None
+
+
+def apply_feedback(classifier, pairs, model_dir, keep_versions=FEEDBACK_KEEP_VERSIONS):
+    """
+    Update the model with already logged (text, label) pairs and publish it,
+    keeping the newest keep_versions registry versions
+    Returns a summary; 'updated' is False when the active model cannot be
+    updated online (an RF+SVM ensemble), in which case the pairs stay only logged
+    """
+    summary = {'logged': len(pairs), 'updated': False}
+    if not pairs:
+        return summary
+    if not classifier.supports_updates():
+        summary['reason'] = NO_UPDATES_REASON
+        return summary
+
+    start = time.perf_counter()
+    classifier.update([text for text, _ in pairs], [label for _, label in pairs])
+    updated = time.perf_counter()
+    summary['version'] = classifier.publish_models(model_dir)
+    published = time.perf_counter()
+    summary['pruned'] = len(ModelRegistry(model_dir).prune(keep_versions))
+
+    summary['updated'] = True
+    summary['timings_ms'] = {
+        'update': round((updated - start) * 1000, 3),
+        'publish': round((published - updated) * 1000, 3)
+    }
+    return summary
+
+
+@contextmanager
+def model_lock(model_dir):
+    """
+    Exclusive lock around load -> update -> publish, so concurrent feedback
+    calls do not publish versions that each miss the other's update
+    """
+    with open(os.path.join(model_dir, FEEDBACK_LOCK_FILE), 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+            return
+
+        # msvcrt locks bytes from the current position, and LK_LOCK gives up
+        # with OSError after about 10 seconds, so keep retrying
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                pass
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def read_pairs(argv, input_stream):
+    if len(argv) >= 3:
+        return [(argv[1], argv[2])]
+
+    pairs = []
+    for line in input_stream:
+        if line.strip():
+            entry = json.loads(line)
+            pairs.append((entry['text'], entry['label']))
+    return pairs
+
+
+def main():
+    from disaster_classifier import DisasterClassifier
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    model_dir = os.path.join(script_dir, 'models')
+
+    logged = 0
+    try:
+        # Logged before anything else, so the correction is kept even if the models fail to load
+        pairs = log_feedback(read_pairs(sys.argv, sys.stdin), model_dir)
+        logged = len(pairs)
+
+        if not pairs or updates_supported(model_dir) is False:
+            # Nothing to apply: an RF+SVM ensemble only collects labels for the next retrain
+            summary = {'logged': logged, 'updated': False}
+            if pairs:
+                summary['reason'] = NO_UPDATES_REASON
+        else:
+            # stdout carries only the JSON summary, so status messages go to stderr
+            with model_lock(model_dir), redirect_stdout(sys.stderr):
+                classifier = DisasterClassifier()
+                if not classifier.load_models(model_dir):
+                    raise RuntimeError(f"No trained models found in {model_dir}")
+                summary = apply_feedback(classifier, pairs, model_dir)
+    except Exception as e:
+        print(json.dumps({'logged': logged, 'updated': False, 'error': str(e)}))
+        sys.exit(1)
+
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Single-pass keyword matcher
+Counts hits for several keyword groups (single words and multi-word phrases)
+with one precompiled regex scan instead of one substring test per keyword
+"""
+
+import re
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+def _trie_regex(keywords):
+    """
+    Build a prefix-factored alternation ("flood(?:ing|ed)?") so the regex engine
+    branches on one character at a time instead of retrying every keyword.
+    Optional suffixes are greedy, so the longest keyword at a position wins.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if end:
+            body = (body if len(branches) > 1 or len(body) == 1 else '(?:' + body + ')') + '?'
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Precompiled matcher over named keyword groups
+
+    With word_boundary=False (parity mode) a keyword counts when it occurs
+    anywhere in the lowercased text, exactly like `keyword in text.lower()`:
+    "help" also matches "helpful" and "fire" matches "wildfire".
+    With word_boundary=True only whole words and phrases count.
+    In both modes each distinct keyword counts once per text.
+    """
+
+    def __init__(self, groups, word_boundary=False):
+        self.word_boundary = word_boundary
+
+        # keyword -> one group name per occurrence in that group's list
+        self.membership = {}
+        for name, keywords in groups.items():
+            for keyword in keywords:
+                self.membership.setdefault(keyword.lower(), []).append(name)
+        self.group_names = list(groups)
+
+        keywords = sorted(self.membership, key=len, reverse=True)
+        alternation = _trie_regex(keywords)
+        if word_boundary:
+            alternation = r'\b(?:' + alternation + r')\b'
+
+        # Zero-width lookahead: the scan tries every position, so overlapping
+        # keywords ("fire" inside "wildfire") are all seen in a single pass
+        self.pattern = re.compile('(?=(' + alternation + '))')
+
+        # Every other keyword matching at the same position is a prefix of the
+        # longest one, so a match implies all of its (boundary-respecting) prefixes
+        self.implied = {
+            keyword: [prefix for prefix in keywords if self._is_prefix_hit(prefix, keyword)]
+            for keyword in keywords
+        }
+
+    def _is_prefix_hit(self, prefix, keyword):
+        if not keyword.startswith(prefix):
+            return False
+        if not self.word_boundary or len(prefix) == len(keyword):
+            return True
+        return not _is_word_char(keyword[len(prefix)])
+
+    def find(self, text):
+        """Return the set of distinct keywords present in text"""
+        found = set()
+        for match in self.pattern.finditer(text.lower()):
+            found.update(self.implied[match.group(1)])
+        return found
+
+    def count(self, text):
+        """Return {group name: number of distinct keywords of that group in text}"""
+        counts = dict.fromkeys(self.group_names, 0)
+        for keyword in self.find(text):
+            for name in self.membership[keyword]:
+                counts[name] += 1
+        return counts
+
+    def matches(self, text):
+        """Return True if any keyword occurs in text"""
+        return self.pattern.search(text.lower()) is not None
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Micro-batching request scheduler
+Concurrent requests are collected for a few milliseconds and scored with one
+batch call, since a model call costs about the same for one row as for dozens
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Collects submitted items into batches for a single scoring thread
+
+    A batch is closed when it reaches max_batch items or when max_wait_ms
+    have passed since its first item arrived, whichever comes first.
+    score_batch(items) must return one result per item; each submit() caller
+    gets its own result (or its own exception) through a Future.
+    """
+
+    def __init__(self, score_batch, max_batch=64, max_wait_ms=5.0):
+        if max_batch < 1:
+            raise ValueError(f"Invalid max_batch {max_batch}, expected at least 1")
+        if max_wait_ms < 0:
+            raise ValueError(f"Invalid max_wait_ms {max_wait_ms}, expected a non-negative value")
+
+        self.score_batch = score_batch
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.pending = queue.Queue()
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.size_histogram = {}
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, item):
+        """Queue one item; returns a Future resolved with its result"""
+        future = Future()
+        self.pending.put((item, future))
+        return future
+
+    def _next_batch(self):
+        """Block for the first item, then gather more until the batch is full or the wait is over"""
+        first = self.pending.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                entry = self.pending.get(timeout=timeout) if timeout > 0 else self.pending.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                # Finish this batch, then stop
+                self.pending.put(None)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            try:
+                results = self.score_batch([item for item, _ in batch])
+            except Exception:
+                # One bad item must not fail its neighbours: retry them one by one
+                for entry in batch:
+                    self._score_one(*entry)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            self._record(len(batch))
+
+    def _score_one(self, item, future):
+        try:
+            future.set_result(self.score_batch([item])[0])
+        except Exception as e:
+            future.set_exception(e)
+
+    def _record(self, size):
+        # Power-of-two buckets: 1, 2-3, 4-7, 8-15, ...
+        low = 1 << (size.bit_length() - 1)
+        bucket = str(low) if low == 1 else f"{low}-{2 * low - 1}"
+        with self.lock:
+            self.batches += 1
+            self.items += size
+            self.size_histogram[bucket] = self.size_histogram.get(bucket, 0) + 1
+
+    def stats(self):
+        """Batch counters and the batch-size histogram"""
+        with self.lock:
+            return {
+                'max_batch': self.max_batch,
+                'max_wait_ms': self.max_wait_ms,
+                'batches': self.batches,
+                'items': self.items,
+                'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+                'batch_size_histogram': dict(sorted(
+                    self.size_histogram.items(), key=lambda bucket: int(bucket[0].split('-')[0])
+                ))
+            }
+
+    def close(self):
+        """Score everything already submitted, then stop the scheduling thread"""
+        self.pending.put(None)
+        self.thread.join()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Versioned model registry
+Every published model set is an immutable directory under
+<model_dir>/versions/<version>/ with a manifest (file checksums, feature
+schema hash, training metrics, library versions). <model_dir>/CURRENT names
+the active version and is replaced atomically, so a reader never mixes files
+from two versions and long-running classifiers can switch on the next request.
+
+Usage:
+    python model_registry.py list
+    python model_registry.py activate <version>     # e.g. roll back
+    python model_registry.py verify [<version>]
+    python model_registry.py prune --keep 5
+"""
+
+import sys
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import platform
+from contextlib import contextmanager
+
+MODEL_VERSIONS_DIR = 'versions'
+CURRENT_VERSION_FILE = 'CURRENT'
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_FORMAT_VERSION = 1
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@contextmanager
+def open_atomic(path, mode='wb', **kwargs):
+    """
+    Open a temporary file that replaces path when the block completes
+    path is never truncated: readers see the old or the new content, and
+    processes that memory-mapped the old file keep its data (a new inode)
+    """
+    temporary_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        with open(temporary_path, mode, **kwargs) as f:
+            yield f
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def write_atomic(path, text):
+    """Write a small file via a temporary name, so readers see the old or the new content"""
+    with open_atomic(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def new_version_name():
+    """
+    <date>-<time>-<microseconds>-<random> in UTC: names sort in publish order, also
+    for versions published within the same second (e.g. by feedback updates) and
+    across daylight saving changes, which would repeat an hour of local time
+    """
+    seconds, nanoseconds = divmod(time.time_ns(), 10 ** 9)
+    return f"{time.strftime('%Y%m%d-%H%M%S', time.gmtime(seconds))}-{nanoseconds // 1000:06d}-{uuid.uuid4().hex[:8]}"
+
+
+class ModelRegistry:
+    """Immutable model versions plus an atomic pointer to the current one"""
+
+    def __init__(self, model_dir):
+        self.model_dir = model_dir
+        self.versions_dir = os.path.join(model_dir, MODEL_VERSIONS_DIR)
+        self.current_path = os.path.join(model_dir, CURRENT_VERSION_FILE)
+
+    def version_dir(self, version):
+        return os.path.join(self.versions_dir, version)
+
+    def current_version(self):
+        """Name of the active version, or None if nothing was published"""
+        try:
+            with open(self.current_path, encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def versions(self):
+        """Published versions, oldest first (names start with a microsecond timestamp)"""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.versions_dir)
+            if not name.startswith('.') and os.path.exists(os.path.join(self.versions_dir, name, MANIFEST_FILE))
+        )
+
+    def manifest(self, version):
+        with open(os.path.join(self.version_dir(version), MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+
+    def publish(self, classifier, model_format='bundle', activate=True):
+        """
+        Save a classifier's models as a new version and (by default) make it current
+        The directory is written under a hidden temporary name and renamed into
+        place complete with its manifest. Returns the version name.
+        """
+        import numpy as np
+        import scipy
+        import sklearn
+
+        version = new_version_name()
+        temporary_dir = os.path.join(self.versions_dir, f".{version}.tmp")
+        classifier.save_models(temporary_dir, model_format)
+
+        files = {
+            name: file_checksum(os.path.join(temporary_dir, name))
+            for name in sorted(os.listdir(temporary_dir))
+        }
+        manifest = {
+            'manifest_version': MANIFEST_FORMAT_VERSION,
+            'version': version,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'model_format': model_format,
+            'model_digest': classifier.model_version,
+            'feature_schema': classifier.feature_schema(),
+            # Lets feedback.py skip loading models that cannot learn online
+            'supports_updates': classifier.supports_updates(),
+            'metrics': getattr(classifier, 'training_metrics', None) or {},
+            'files': files,
+            'libraries': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'scipy': scipy.__version__,
+                'sklearn': sklearn.__version__
+            }
+        }
+        write_atomic(os.path.join(temporary_dir, MANIFEST_FILE), json.dumps(manifest, indent=2))
+        os.rename(temporary_dir, self.version_dir(version))
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version):
+        """Atomically point CURRENT at an existing, intact version"""
+        self.verify(version)
+        write_atomic(self.current_path, version + '\n')
+
+    def verify(self, version):
+        """Check every file against the manifest checksums; returns the manifest"""
+        try:
+            manifest = self.manifest(version)
+        except FileNotFoundError:
+            raise ValueError(f"Model version '{version}' has no manifest") from None
+
+        version_dir = self.version_dir(version)
+        for name, checksum in manifest['files'].items():
+            path = os.path.join(version_dir, name)
+            if not os.path.exists(path):
+                raise ValueError(f"Model version '{version}' is missing {name}")
+            if file_checksum(path) != checksum:
+                raise ValueError(f"Checksum mismatch for {name} in model version '{version}'")
+        return manifest
+
+    def prune(self, keep):
+        """Delete all but the newest `keep` versions, never the current one; returns the deleted names"""
+        current = self.current_version()
+        versions = self.versions()
+        stale = [version for version in versions[:max(0, len(versions) - keep)] if version != current]
+        for version in stale:
+            shutil.rmtree(self.version_dir(version))
+        return stale
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage published disaster classifier models")
+    parser.add_argument('command', choices=['list', 'activate', 'verify', 'prune'])
+    parser.add_argument('version', nargs='?')
+    parser.add_argument('--keep', type=int, default=5, help='versions kept by prune')
+    parser.add_argument('--model-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models'))
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.model_dir)
+    current = registry.current_version()
+
+    try:
+        if args.command == 'list':
+            for version in registry.versions():
+                metrics = registry.manifest(version).get('metrics', {})
+                summary = ', '.join(f"{name}={value:.3f}" for name, value in metrics.items()
+                                    if isinstance(value, float) and name.endswith('accuracy'))
+                print(f"{'*' if version == current else ' '} {version}  {summary}")
+        elif args.command == 'activate':
+            if not args.version:
+                parser.error("activate needs a version")
+            registry.activate(args.version)
+            print(f"Activated {args.version}")
+        elif args.command == 'verify':
+            version = args.version or current
+            if not version:
+                parser.error("nothing published yet; pass a version")
+            registry.verify(version)
+            print(f"{version}: all checksums match")
+        else:
+            for version in registry.prune(args.keep):
+                print(f"Deleted {version}")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Prediction result cache
+Identical complaints (copy-pasted pleas, frontend retries, forwarded alerts)
+are scored once per model version and served from memory afterwards
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache with optional TTL, keyed by normalized text + model version
+
+    Keys are case-insensitive: every classifier feature is computed on lowercased
+    text or is case-independent (length, word count, punctuation), so two texts
+    differing only in case always get the same prediction.
+    """
+
+    def __init__(self, max_size=10000, ttl=None, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def normalize(text):
+        lowered = text.lower()
+        # A few characters change length when lowercased, which would change
+        # the text_length feature; keep those texts as they are
+        return lowered if len(lowered) == len(text) else text
+
+    def key(self, text, version, *extra):
+        """Hash of the normalized text, the model version and any extra options"""
+        digest = hashlib.sha256()
+        for part in (version, *extra):
+            digest.update(str(part).encode('utf-8') + b'\0')
+        digest.update(self.normalize(text).encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached value, or None on a miss"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and self.ttl is not None and self.clock() - entry[1] > self.ttl:
+                del self.entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, self.clock())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Built-in profiling for classifier and training runs
+RunProfiler records a cProfile of the run and tracemalloc allocation sites,
+and writes a text report (hot functions, peak traced memory, the largest
+allocation sites seen near the peak) plus the raw profile as <report>.prof
+for pstats / snakeviz
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    # Unix only; the report then has no peak RSS line
+    resource = None
+
+DEFAULT_TOP = 25
+# How often the memory monitor checks whether traced memory reached a new peak
+MEMORY_POLL_INTERVAL = 0.05
+# A new peak snapshot is only taken once memory grew this much past the last one
+MEMORY_SNAPSHOT_GROWTH = 1.1
+PROFILE_OPTION = '--profile'
+
+# Allocations made by the profiler itself are left out of the report
+IGNORED_FILES = (tracemalloc.__file__, '<unknown>')
+
+
+def default_report_path(script):
+    name = os.path.splitext(os.path.basename(script))[0]
+    return f"profile-{name}-{time.strftime('%Y%m%d-%H%M%S')}.txt"
+
+
+def pop_profile_option(argv):
+    """
+    Remove --profile / --profile=<report> from argv (in place) for the CLIs
+    that parse sys.argv by position; returns the report path or None
+    """
+    for index, arg in enumerate(argv[1:], 1):
+        if arg == PROFILE_OPTION or arg.startswith(PROFILE_OPTION + '='):
+            del argv[index]
+            return arg.partition('=')[2] or default_report_path(argv[0])
+    return None
+
+
+class RunProfiler:
+    """
+    Context manager that profiles the code run inside it
+
+    cProfile covers the thread that enters the block; work done on other
+    threads or in child processes (n_jobs pools, forked workers) is not
+    attributed. tracemalloc slows allocation-heavy code by roughly 2-3x, so
+    compare timings between profiled runs only.
+    """
+
+    def __init__(self, report_path, top=DEFAULT_TOP, memory=True, frames=1):
+        self.report_path = report_path
+        self.top = top
+        self.memory = memory
+        self.frames = frames
+        self.profile = cProfile.Profile()
+        self.peak_snapshot = None
+        self.peak_snapshot_size = 0
+        self.stopped = threading.Event()
+        self.monitor = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        if self.memory:
+            tracemalloc.start(self.frames)
+            self.monitor = threading.Thread(target=self._watch_memory, daemon=True)
+            self.monitor.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+        elapsed = time.perf_counter() - self.start
+
+        memory = None
+        if self.memory:
+            self.stopped.set()
+            self.monitor.join()
+            final = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            memory = {'current': current, 'peak': peak, 'final': final}
+
+        self.write_report(elapsed, memory)
+        print(f"Profile written to {self.report_path}", file=sys.stderr)
+        return False
+
+    def _watch_memory(self):
+        """Snapshot the allocations whenever traced memory reaches a new high"""
+        while not self.stopped.wait(MEMORY_POLL_INTERVAL):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self.peak_snapshot_size * MEMORY_SNAPSHOT_GROWTH:
+                self.peak_snapshot = tracemalloc.take_snapshot()
+                self.peak_snapshot_size = current
+
+    def allocation_sites(self, snapshot):
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, name) for name in IGNORED_FILES])
+        return snapshot.statistics('lineno')[:self.top]
+
+    def write_report(self, elapsed, memory):
+        self.profile.dump_stats(self.report_path + '.prof')
+
+        out = io.StringIO()
+        out.write(f"Command: {' '.join(sys.argv)}\n")
+        out.write(f"Wall time: {elapsed:.3f}s\n")
+        if resource is not None:
+            out.write(f"Peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB\n")
+        if memory is not None:
+            out.write(f"Peak traced memory: {memory['peak'] / 2 ** 20:.1f} MB "
+                      f"(still allocated at exit: {memory['current'] / 2 ** 20:.1f} MB)\n")
+
+        for sort, title in (('cumulative', 'cumulative time'), ('tottime', 'own time')):
+            out.write(f"\n=== Top {self.top} functions by {title} ===\n")
+            pstats.Stats(self.profile, stream=out).sort_stats(sort).print_stats(self.top)
+
+        if memory is not None:
+            sections = [('at exit', memory['final'])]
+            if self.peak_snapshot is not None:
+                sections.insert(0, (f"near the peak ({self.peak_snapshot_size / 2 ** 20:.1f} MB traced)",
+                                    self.peak_snapshot))
+            for title, snapshot in sections:
+                out.write(f"\n=== Largest allocation sites {title} ===\n")
+                out.write("(<frozen importlib...> lines are module code loaded by imports; "
+                          "memory-mapped model arrays are not traced)\n")
+                for stat in self.allocation_sites(snapshot):
+                    frame = stat.traceback[0]
+                    out.write(f"{stat.size / 2 ** 20:10.2f} MB {stat.count:>9} blocks  {frame.filename}:{frame.lineno}\n")
+
+        with open(self.report_path, 'w', encoding='utf-8') as f:
+            f.write(out.getvalue())
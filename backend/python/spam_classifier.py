@@ -3,41 +3,129 @@
 Simple spam classifier for disaster complaints
 """
 import sys
-import re
+import os
+import json
+import hashlib
+from keyword_matcher import KeywordMatcher
+from stage_metrics import stage_timer
 
-def is_spam(text):
+# Define spam indicators
+SPAM_WORDS = [
+    'lottery', 'winner', 'prize', 'free', 'money', 'cash', 'credit',
+    'loan', 'debt', 'investment', 'bitcoin', 'crypto', 'offer',
+    'discount', 'buy now', 'limited time', 'click here', 'subscribe',
+    'casino', 'betting', 'gambling', 'dating', 'singles', 'hot',
+    'meet singles', 'weight loss', 'diet', 'pills', 'medication',
+    'viagra', 'cialis', 'enlargement', 'miracle', 'cure', 'hair loss',
+    'wrinkle', 'anti-aging', 'fountain of youth'
+]
+
+# Thresholds of the non-keyword rules
+MAX_EXCLAMATIONS = 3
+MAX_DOLLARS = 2
+MIN_WORDS = 3
+
+# Optional rule file next to this module; overrides the built-in rules when present
+SPAM_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'spam_rules.json')
+
+class SpamClassifier:
     """
-    A simple rule-based spam classifier
-    In a real application, this would be replaced with a proper ML model
+    Rule-based spam classifier with the keyword rules precompiled
+    All spam words are matched by one word-boundary regex in a single scan,
+    instead of compiling and running one regex per word on every call
     """
-    # Convert to lowercase
-    text = text.lower()
     
-    # Define spam indicators
-    spam_words = [
-        'lottery', 'winner', 'prize', 'free', 'money', 'cash', 'credit',
-        'loan', 'debt', 'investment', 'bitcoin', 'crypto', 'offer',
-        'discount', 'buy now', 'limited time', 'click here', 'subscribe',
-        'casino', 'betting', 'gambling', 'dating', 'singles', 'hot',
-        'meet singles', 'weight loss', 'diet', 'pills', 'medication',
-        'viagra', 'cialis', 'enlargement', 'miracle', 'cure', 'hair loss',
-        'wrinkle', 'anti-aging', 'fountain of youth'
-    ]
+    def __init__(self, words=SPAM_WORDS, max_exclamations=MAX_EXCLAMATIONS,
+                 max_dollars=MAX_DOLLARS, min_words=MIN_WORDS, metrics=None):
+        self.words = list(words)
+        self.max_exclamations = max_exclamations
+        self.max_dollars = max_dollars
+        self.min_words = min_words
+        self.matcher = KeywordMatcher({'spam': self.words}, word_boundary=True)
+        
+        # Cache version of the rules: changes whenever the rules change
+        rules = json.dumps([self.words, max_exclamations, max_dollars, min_words])
+        self.rules_version = hashlib.sha256(rules.encode('utf-8')).hexdigest()[:16]
+        
+        # Optional StageMetrics; rule checks are recorded as the 'spam' stage
+        self.metrics = metrics
     
-    # Check for spam indicators
-    for word in spam_words:
-        if re.search(r'\b' + re.escape(word) + r'\b', text):
-            return True
+    @classmethod
+    def from_config(cls, path):
+        """
+        Load rules from a JSON file:
+        {"words": [...], "max_exclamations": 3, "max_dollars": 2, "min_words": 3}
+        Only "words" is required
+        """
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        
+        return cls(
+            words=config['words'],
+            max_exclamations=config.get('max_exclamations', MAX_EXCLAMATIONS),
+            max_dollars=config.get('max_dollars', MAX_DOLLARS),
+            min_words=config.get('min_words', MIN_WORDS)
+        )
     
-    # Check for excessive punctuation or capitalization
-    if text.count('!') > 3 or text.count('$') > 2:
-        return True
+    def is_spam(self, text, cache=None, metrics=None):
+        """
+        Check one text against the rules
+        An optional PredictionCache skips re-evaluating texts already seen;
+        metrics (a StageMetrics) records the call instead of self.metrics
+        """
+        metrics = self.metrics if metrics is None else metrics
+        if cache is None:
+            with stage_timer(metrics, 'spam'):
+                return self._check_rules(text)
+        
+        key = cache.key(text, self.rules_version)
+        result = cache.get(key)
+        if result is None:
+            with stage_timer(metrics, 'spam'):
+                result = self._check_rules(text)
+            cache.set(key, result)
+        return result
     
-    # Check for very short messages
-    if len(text.split()) < 3:
-        return True
+    def is_spam_many(self, texts, cache=None, metrics=None):
+        """is_spam() for a list of texts"""
+        metrics = self.metrics if metrics is None else metrics
+        if cache is None:
+            with stage_timer(metrics, 'spam', len(texts)):
+                return [self._check_rules(text) for text in texts]
+        return [self.is_spam(text, cache, metrics) for text in texts]
     
-    return False
+    def _check_rules(self, text):
+        # Cheap counting rules first, the keyword scan only if they all pass
+        # (punctuation and word counts do not depend on case)
+        if text.count('!') > self.max_exclamations or text.count('$') > self.max_dollars:
+            return True
+        
+        # Check for very short messages
+        if len(text.split()) < self.min_words:
+            return True
+        
+        # Check for spam indicators
+        return self.matcher.matches(text)
+
+def load_spam_classifier(path=SPAM_RULES_FILE):
+    """SpamClassifier from the rule file if it exists, else with the built-in rules"""
+    if os.path.exists(path):
+        return SpamClassifier.from_config(path)
+    return SpamClassifier()
+
+default_classifier = load_spam_classifier()
+
+# Cache version of the default rules
+RULES_VERSION = default_classifier.rules_version
+
+def is_spam(text, cache=None, metrics=None):
+    """
+    A simple rule-based spam classifier
+    In a real application, this would be replaced with a proper ML model
+    An optional PredictionCache skips re-evaluating texts already seen, and an
+    optional StageMetrics records the check as the 'spam' stage
+    """
+    return default_classifier.is_spam(text, cache, metrics)
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Per-stage latency histograms for the classification path
+Each timed stage (preprocessing, vectorization, each estimator, spam rules,
+...) gets a fixed-bucket histogram of call durations plus a row counter,
+exportable as a JSON snapshot or in the Prometheus text exposition format
+"""
+
+import bisect
+import threading
+import time
+from contextlib import nullcontext
+
+METRIC_PREFIX = 'dream_classifier'
+
+# Histogram upper bounds in seconds (+Inf is implicit)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Returned by timer() when metrics are disabled, so the hooks cost one attribute check
+NULL_TIMER = nullcontext()
+
+
+class _StageTimer:
+    __slots__ = ('metrics', 'stage', 'rows', 'start')
+
+    def __init__(self, metrics, stage, rows):
+        self.metrics = metrics
+        self.stage = stage
+        self.rows = rows
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start, self.rows)
+        return False
+
+
+class StageMetrics:
+    """
+    Thread-safe latency histograms keyed by stage name
+
+    One observation is one call of a stage, whether it handled one row or a
+    batch; the row counter tells the two apart (sum / rows is time per row).
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix=METRIC_PREFIX):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.started = time.time()
+        # stage -> [per-bucket counts (last one is +Inf), calls, rows, total seconds]
+        self.stages = {}
+
+    def timer(self, stage, rows=1):
+        """Context manager that records the duration of its block"""
+        return _StageTimer(self, stage, rows)
+
+    def observe(self, stage, seconds, rows=1):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self.lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                entry = self.stages[stage] = [[0] * (len(self.buckets) + 1), 0, 0, 0.0]
+            entry[0][index] += 1
+            entry[1] += 1
+            entry[2] += rows
+            entry[3] += seconds
+
+    def reset(self):
+        with self.lock:
+            self.stages = {}
+            self.started = time.time()
+
+    def _copy(self):
+        with self.lock:
+            return {stage: (list(counts), calls, rows, total)
+                    for stage, (counts, calls, rows, total) in self.stages.items()}
+
+    def _quantile(self, counts, calls, fraction):
+        """Upper bound of the bucket holding the given quantile (None past the last bound)"""
+        target = fraction * calls
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return None
+
+    def snapshot(self):
+        """JSON-serializable summary per stage; quantiles are histogram bucket bounds"""
+        stages = {}
+        for stage, (counts, calls, rows, total) in sorted(self._copy().items()):
+            quantiles = {}
+            for name, fraction in (('p50_ms', 0.5), ('p95_ms', 0.95), ('p99_ms', 0.99)):
+                bound = self._quantile(counts, calls, fraction)
+                quantiles[name] = None if bound is None else bound * 1000
+            stages[stage] = {
+                'calls': calls,
+                'rows': rows,
+                'total_ms': round(total * 1000, 3),
+                'mean_ms': round(total * 1000 / calls, 4) if calls else 0.0,
+                **quantiles
+            }
+        return {'since': round(self.started, 3), 'stages': stages}
+
+    def prometheus(self):
+        """The histograms in the Prometheus text exposition format"""
+        name = f"{self.prefix}_stage_seconds"
+        rows_name = f"{self.prefix}_stage_rows_total"
+        stages = sorted(self._copy().items())
+
+        lines = [
+            f"# HELP {name} Time spent per classifier stage call",
+            f"# TYPE {name} histogram"
+        ]
+        for stage, (counts, calls, _, total) in stages:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {calls}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {total:.9g}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {calls}')
+
+        lines.append(f"# HELP {rows_name} Rows processed per classifier stage")
+        lines.append(f"# TYPE {rows_name} counter")
+        for stage, (_, _, rows, _) in stages:
+            lines.append(f'{rows_name}{{stage="{stage}"}} {rows}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, metrics_format='json'):
+        if metrics_format == 'prometheus':
+            return self.prometheus()
+        if metrics_format == 'json':
+            return self.snapshot()
+        raise ValueError(f"Unknown metrics format '{metrics_format}', expected json or prometheus")
+
+
+def stage_timer(metrics, stage, rows=1):
+    """metrics.timer(stage, rows), or a shared no-op context when metrics is None"""
+    if metrics is None:
+        return NULL_TIMER
+    return metrics.timer(stage, rows)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for hot reloads in serve mode
+Publishes new model versions while serve() and serve_batched() are answering
+requests and checks that stdout carries nothing but one JSON response per request
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from disaster_classifier import DisasterClassifier, serve, serve_batched
+
+TEXTS = [
+    "Severe flooding in downtown area, need immediate evacuation assistance",
+    "Street light not working on main road",
+    "Earthquake damaged our building, people trapped inside"
+]
+
+
+class PublishingInput:
+    """Serve-mode input that publishes a new model version before the given lines"""
+
+    def __init__(self, lines, publish_before, publisher, registry_dir, serving):
+        self.lines = list(lines)
+        self.publish_before = set(publish_before)
+        self.publisher = publisher
+        self.registry_dir = registry_dir
+        self.serving = serving
+        self.position = 0
+
+    def readline(self):
+        if self.position == len(self.lines):
+            return ''
+        if self.position in self.publish_before:
+            with redirect_stdout(io.StringIO()):
+                self.publisher.publish_models(self.registry_dir)
+            # Make the next request run the periodic registry check
+            self.serving.last_reload_check = float('-inf')
+        self.position += 1
+        return self.lines[self.position - 1] + '\n'
+
+
+def run(name, serve_function, publisher, registry_dir):
+    serving = DisasterClassifier()
+    with redirect_stdout(sys.stderr):
+        serving.load_models(registry_dir)
+    first_version = serving.registry_version
+
+    lines = [json.dumps({'id': i, 'text': text}) for i, text in enumerate(TEXTS)]
+    lines += [json.dumps({'id': 'reload', 'cmd': 'reload'})]
+    lines += [json.dumps({'id': i + len(TEXTS), 'text': text}) for i, text in enumerate(TEXTS)]
+    # One publish picked up by the reload command, one by the periodic check
+    input_stream = PublishingInput(lines, [2, len(TEXTS) + 2], publisher, registry_dir, serving)
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        serve_function(serving, input_stream)
+
+    failures = []
+    responses = []
+    for line in output.getvalue().splitlines():
+        try:
+            responses.append(json.loads(line))
+        except ValueError:
+            failures.append(f"non-JSON line on stdout: {line!r}")
+    if len(responses) != len(lines):
+        failures.append(f"{len(responses)} responses for {len(lines)} requests")
+    if serving.registry_version in (None, first_version):
+        failures.append("the published version was not loaded")
+
+    print(f"{name}: {len(responses)} responses, reloaded {first_version} -> {serving.registry_version}")
+    for failure in failures:
+        print(f"   ✗ {failure}")
+    if not failures:
+        print("   ✓ stdout carried only JSON responses")
+    return not failures
+
+
+def main():
+    print("=== Serve Mode Hot Reload Test ===")
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    publisher = DisasterClassifier()
+    with redirect_stdout(sys.stderr):
+        if not publisher.load_models(os.path.join(script_dir, 'models')):
+            print("No trained models found. Please run train_disaster_model.py first.")
+            sys.exit(1)
+
+    registry_dir = tempfile.mkdtemp(prefix='serve-reload-')
+    try:
+        with redirect_stdout(io.StringIO()):
+            publisher.publish_models(registry_dir)
+        passed = all([
+            run('serve', lambda classifier, stream: serve(classifier, stream), publisher, registry_dir),
+            run('serve_batched', lambda classifier, stream: serve_batched(classifier, 4, 5.0, stream),
+                publisher, registry_dir)
+        ])
+    finally:
+        shutil.rmtree(registry_dir)
+
+    print("\nTest passed!" if passed else "\nTest failed!")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
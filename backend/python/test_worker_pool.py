@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for worker deaths in multi-process serve mode
+Crashes one worker with os._exit() while it holds requests and kills another
+with SIGKILL, then checks that serve_pool() still answers every request in
+order and returns
+"""
+
+import io
+import os
+import sys
+import json
+import signal
+import threading
+from contextlib import redirect_stdout
+from disaster_classifier import DisasterClassifier, handle_request, serve_pool
+from worker_pool import WorkerPool
+
+CRASH_TEXT = 'crash this worker'
+TEXTS = [
+    "Severe flooding in downtown area, need immediate evacuation assistance",
+    "Street light not working on main road",
+    "Earthquake damaged our building, people trapped inside"
+]
+TIMEOUT = 60
+
+
+def crashing_handler(classifier, request):
+    """handle_request(), except that CRASH_TEXT kills the worker like an OOM kill would"""
+    if request.get('text') == CRASH_TEXT:
+        os._exit(1)
+    return handle_request(classifier, request)
+
+
+class KillingInput:
+    """Serve-mode input that SIGKILLs a worker before the given line"""
+
+    def __init__(self, lines, kill_before, pool):
+        self.lines = list(lines)
+        self.kill_before = kill_before
+        self.pool = pool
+        self.position = 0
+
+    def readline(self):
+        if self.position == len(self.lines):
+            return ''
+        if self.position == self.kill_before:
+            os.kill(self.pool.processes[-1].process.pid, signal.SIGKILL)
+        self.position += 1
+        return self.lines[self.position - 1] + '\n'
+
+
+def main():
+    print("=== Worker Pool Crash Test ===")
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    classifier = DisasterClassifier()
+    with redirect_stdout(sys.stderr):
+        if not classifier.load_models(os.path.join(script_dir, 'models')):
+            print("No trained models found. Please run train_disaster_model.py first.")
+            sys.exit(1)
+
+    texts = TEXTS * 10
+    texts[5] = CRASH_TEXT
+    lines = [json.dumps({'id': i, 'text': text}) for i, text in enumerate(texts)]
+
+    pool = WorkerPool(classifier, crashing_handler, 2, queue_size=4).start()
+    output = io.StringIO()
+    server = threading.Thread(target=serve_pool, args=(pool, KillingInput(lines, 20, pool), output),
+                              daemon=True)
+    server.start()
+    server.join(TIMEOUT)
+
+    failures = []
+    if server.is_alive():
+        failures.append(f"serve_pool() did not return within {TIMEOUT}s")
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+    if [response.get('id') for response in responses] != list(range(len(lines))):
+        failures.append(f"{len(responses)} responses for {len(lines)} requests, or out of order")
+    if not any(response.get('id') == 5 and 'error' in response for response in responses):
+        failures.append("the request that crashed its worker was not answered with an error")
+    if any(response.get('result') == 'verified' and 'error' in response for response in responses):
+        failures.append("a failed request was auto-verified")
+    answered = sum('error' not in response for response in responses)
+    stats = pool.stats()
+    if stats['restarts'] != 2:
+        failures.append(f"{stats['restarts']} worker restarts, expected 2")
+
+    print(f"{len(responses)} responses, {answered} answered by the models, {stats['restarts']} restarts")
+    for failure in failures:
+        print(f"   ✗ {failure}")
+    if not failures:
+        print("   ✓ every request was answered after the worker deaths")
+
+    print("\nTest passed!" if not failures else "\nTest failed!")
+    sys.exit(0 if not failures else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,36 +6,79 @@ This script trains both Random Forest and SVM models and saves them for future u
 
 import os
 import sys
-from disaster_classifier import DisasterClassifier
+import argparse
+from disaster_classifier import DisasterClassifier, FEATURE_DTYPES
+from profiling import RunProfiler, DEFAULT_TOP, default_report_path
 
 def main():
+    parser = argparse.ArgumentParser(description="Train the disaster classification models")
+    parser.add_argument('--n-jobs', type=int, default=-1,
+                        help='cores for preprocessing, forest building and CV folds (-1 = all)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='recompute the preprocessed features instead of reusing cached ones')
+    parser.add_argument('--dataset', help='training CSV (default: the bundled dataset)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='stream the dataset in chunks into a linear model (for archives too large for memory)')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='rows per chunk with --incremental')
+    parser.add_argument('--epochs', type=int, default=5, help='passes over the dataset with --incremental')
+    parser.add_argument('--compact-forest', action='store_true',
+                        help='publish the random forest as a CompactForest (same predictions, faster scoring)')
+    parser.add_argument('--compress-svm', action='store_true',
+                        help='also fit a compressed SVM (select it with --serve --compressed-svm)')
+    parser.add_argument('--dtype', choices=FEATURE_DTYPES, default='float64',
+                        help='feature and model precision (float32 halves feature memory, see README)')
+    parser.add_argument('--profile', nargs='?', const='', metavar='REPORT',
+                        help='write a cProfile + tracemalloc report for the run (use --n-jobs 1 to profile all work)')
+    parser.add_argument('--profile-top', type=int, default=DEFAULT_TOP, help='functions and allocation sites listed')
+    args = parser.parse_args()
+    
+    if args.profile is None:
+        train(args)
+        return
+    
+    with RunProfiler(args.profile or default_report_path(__file__), top=args.profile_top):
+        train(args)
+
+def train(args):
     print("=== Disaster Classification Model Training ===")
     print("Training with your dataset using 95% train / 5% test split")
     print("Using Random Forest and SVM algorithms")
     
     # Initialize classifier
-    classifier = DisasterClassifier()
+    classifier = DisasterClassifier(dtype=args.dtype)
     
     # Get current script directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     model_dir = os.path.join(script_dir, 'models')
-    csv_path = os.path.join(script_dir, 'disaster_complaints_dataset.csv')
+    csv_path = args.dataset or os.path.join(script_dir, 'disaster_complaints_dataset.csv')
+    cache_dir = None if args.no_cache else os.path.join(model_dir, '.cache')
     
     try:
         # Train models with the provided dataset
         print(f"\nLoading dataset from: {csv_path}")
         print("Starting training process...")
-        X_test, y_test = classifier.train_models(csv_path)
+        if args.incremental:
+            classifier.train_incremental(csv_path, chunk_size=args.chunk_size, epochs=args.epochs)
+        else:
+            X_test, y_test = classifier.train_models(csv_path, n_jobs=args.n_jobs, cache_dir=cache_dir)
+            if args.compress_svm:
+                classifier.train_compressed_svm(csv_path)
+            if args.compact_forest:
+                classifier.compile_forest()
         
-        # Save models
+        # Publish models as a new registry version; running classifiers pick it up
         print("\nSaving models...")
-        classifier.save_models(model_dir)
+        version = classifier.publish_models(model_dir)
         
         print("\n=== Training Summary ===")
-        print("* Random Forest model trained and saved")
-        print("* SVM model trained and saved")
-        print("* TF-IDF vectorizer trained and saved")
-        print(f"* Models saved to: {model_dir}")
+        if args.incremental:
+            print("* Incremental linear model trained and saved")
+            print("* Hashing vectorizer saved")
+        else:
+            print("* Random Forest model trained and saved")
+            print("* SVM model trained and saved")
+            print("* TF-IDF vectorizer trained and saved")
+        print(f"* Models saved to: {model_dir} (version {version})")
         
         # Test with sample predictions
         print("\n=== Sample Predictions ===")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Multi-process classifier serving
+Workers are forked after the models are loaded, so every worker shares the
+parent's model pages copy-on-write (and the memory-mapped bundle arrays)
+instead of loading its own copy
+"""
+
+import gc
+import sys
+import queue
+import threading
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import wait
+
+
+def error_response(request, message):
+    """Same fallback as the one-shot CLI: never auto-verify on error"""
+    response = {'id': request['id']} if isinstance(request, dict) and 'id' in request else {}
+    response.update({'result': 'not_verified', 'error': message})
+    return response
+
+
+def _worker_main(classifier, handler, requests, results):
+    """Worker loop: answer (sequence, request) items until the None sentinel"""
+    try:
+        for sequence, request in iter(requests.recv, None):
+            try:
+                response = handler(classifier, request)
+            except Exception as e:
+                response = error_response(request, str(e))
+            results.send((sequence, response))
+    except EOFError:
+        # The parent went away
+        pass
+
+
+class _Worker:
+    """One worker process, its request and result pipes, and the requests it holds"""
+
+    def __init__(self, index, process, requests, results):
+        self.index = index
+        self.process = process
+        self.requests = requests
+        self.results = results
+        self.in_flight = {}
+
+
+class WorkerPool:
+    """
+    Fixed set of forked workers, each fed through its own pipe
+
+    submit() blocks once workers + queue_size requests are in flight, so a
+    burst backs up into the caller instead of growing queues without limit.
+    Each request goes to the worker with the fewest in flight. Results come
+    back in completion order with the sequence number submit() returned;
+    callers that need request order reorder on that number.
+
+    A worker that dies (OOM kill, crash in native code) is noticed by
+    get_result(): the requests it held are answered with a not_verified
+    error response and a replacement worker is forked in its place.
+    """
+
+    def __init__(self, classifier, handler, workers, queue_size=64):
+        if workers < 1:
+            raise ValueError(f"Invalid worker count {workers}, expected at least 1")
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("WorkerPool needs the 'fork' start method to share the loaded models")
+
+        self.classifier = classifier
+        self.handler = handler
+        self.workers = workers
+        self.queue_size = queue_size
+
+        self.context = multiprocessing.get_context('fork')
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        # Guards the worker list and the in-flight bookkeeping, shared by the
+        # submitting thread and the one reading results
+        self.lock = threading.Lock()
+        self.processes = []
+        self.finished = deque()
+
+        self.submitted = 0
+        self.completed = 0
+        self.completed_by_worker = [0] * workers
+        self.restarts = 0
+
+    def start(self):
+        # Objects that exist now are never collected in the workers, so the
+        # collector does not write to (and copy) the shared model pages
+        gc.collect()
+        gc.freeze()
+
+        self.processes = [self._start_worker(index) for index in range(self.workers)]
+        return self
+
+    def _start_worker(self, index):
+        request_reader, request_writer = self.context.Pipe(duplex=False)
+        result_reader, result_writer = self.context.Pipe(duplex=False)
+        process = self.context.Process(
+            target=_worker_main,
+            args=(self.classifier, self.handler, request_reader, result_writer),
+            daemon=True
+        )
+        process.start()
+        # The worker's ends stay open in the worker only
+        request_reader.close()
+        result_writer.close()
+        return _Worker(index, process, request_writer, result_reader)
+
+    def submit(self, request):
+        """Queue a request, blocking while the pool is full; returns its sequence number"""
+        self.slots.acquire()
+        with self.lock:
+            sequence = self.submitted
+            self.submitted += 1
+            worker = min(self.processes, key=lambda worker: len(worker.in_flight))
+            worker.in_flight[sequence] = request
+        try:
+            worker.requests.send((sequence, request))
+        except OSError:
+            # The worker died; get_result() answers the requests it held
+            pass
+        return sequence
+
+    def get_result(self, timeout=None):
+        """Next finished (sequence, response); raises queue.Empty on timeout"""
+        while not self.finished:
+            with self.lock:
+                workers = list(self.processes)
+            ready = wait([worker.results for worker in workers] +
+                         [worker.process.sentinel for worker in workers], timeout)
+            if not ready:
+                raise queue.Empty
+            for worker in workers:
+                if worker.results in ready:
+                    self._receive(worker)
+                elif worker.process.sentinel in ready:
+                    self._replace(worker)
+        return self.finished.popleft()
+
+    def _receive(self, worker):
+        try:
+            sequence, response = worker.results.recv()
+        except (EOFError, OSError):
+            self._replace(worker)
+            return
+        self._complete(worker, sequence, response)
+
+    def _complete(self, worker, sequence, response):
+        with self.lock:
+            worker.in_flight.pop(sequence, None)
+            self.completed += 1
+            self.completed_by_worker[worker.index] += 1
+        self.slots.release()
+        self.finished.append((sequence, response))
+
+    def _replace(self, worker):
+        """Answer a dead worker's requests with errors and fork a replacement"""
+        # Results it sent before dying are still valid
+        try:
+            while worker.results.poll():
+                sequence, response = worker.results.recv()
+                self._complete(worker, sequence, response)
+        except (EOFError, OSError):
+            pass
+        worker.process.join(timeout=1.0)
+        message = f"Worker {worker.index} exited unexpectedly (exit code {worker.process.exitcode})"
+        print(message, file=sys.stderr)
+
+        with self.lock:
+            held = worker.in_flight
+            worker.in_flight = {}
+            self.processes[worker.index] = self._start_worker(worker.index)
+            self.restarts += 1
+        worker.requests.close()
+        worker.results.close()
+
+        for sequence, request in sorted(held.items()):
+            self._complete(worker, sequence, error_response(request, message))
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'in_flight': self.submitted - self.completed,
+            'completed_by_worker': list(self.completed_by_worker),
+            'restarts': self.restarts
+        }
+
+    def close(self):
+        """Stop the workers after they finish the queued requests"""
+        for worker in self.processes:
+            try:
+                worker.requests.send(None)
+            except OSError:
+                pass
+        for worker in self.processes:
+            worker.process.join()
+            worker.requests.close()
+            worker.results.close()
+        self.processes = []
+        gc.unfreeze()
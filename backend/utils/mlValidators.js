@@ -68,7 +68,85 @@ async function runDisasterClassifier(text) {
   });
 }
 
+/**
+ * Run spam check and disaster classification in one Python process
+ * Disaster classification is skipped for spam
+ * @param {string} text - The complaint text
+ * @returns {Promise<{isSpam: boolean, isVerified: boolean, confidence?: number, timingsMs?: object}>}
+ */
+async function runComplaintPipeline(text) {
+  return new Promise((resolve, reject) => {
+    const options = {
+      mode: 'text',
+      pythonPath: 'python',
+      scriptPath: path.join(__dirname, '../python'),
+      args: [text],
+    };
+
+    PythonShell.run('complaint_pipeline.py', options, (err, results) => {
+      if (err) {
+        console.error('❌ Complaint pipeline error:', err);
+        // Not spam and not verified on error, so the complaint goes to manual verification
+        resolve({ isSpam: false, isVerified: false, error: err.message });
+        return;
+      }
+
+      try {
+        const verdict = JSON.parse(results[results.length - 1]);
+        const isVerified = verdict.result === 'verified';
+        console.log(`Complaint pipeline result: ${verdict.spam ? 'SPAM' : isVerified ? 'VERIFIED' : 'NOT VERIFIED'}`);
+        resolve({
+          isSpam: verdict.spam,
+          isVerified,
+          confidence: verdict.confidence,
+          timingsMs: verdict.timings_ms,
+          error: verdict.error
+        });
+      } catch (parseError) {
+        resolve({ isSpam: false, isVerified: false, error: 'No result from complaint pipeline' });
+      }
+    });
+  });
+}
+
+/**
+ * Send an admin's verification decision to the classifier's feedback loop
+ * The label is logged and, if the active model supports it, applied online
+ * @param {string} text - The complaint text
+ * @param {boolean} verified - The admin's decision
+ * @returns {Promise<{updated: boolean, version?: string, error?: string}>}
+ */
+async function submitClassifierFeedback(text, verified) {
+  return new Promise((resolve) => {
+    const options = {
+      mode: 'text',
+      pythonPath: 'python',
+      scriptPath: path.join(__dirname, '../python'),
+      args: [text, verified ? 'verified' : 'not_verified'],
+    };
+
+    PythonShell.run('feedback.py', options, (err, results) => {
+      if (err) {
+        // Feedback is best effort: never fail the admin action because of it
+        console.error('❌ Classifier feedback error:', err);
+        resolve({ updated: false, error: err.message });
+        return;
+      }
+
+      try {
+        const summary = JSON.parse(results[results.length - 1]);
+        console.log(`Classifier feedback: ${summary.updated ? `model updated (${summary.version})` : 'logged'}`);
+        resolve(summary);
+      } catch (parseError) {
+        resolve({ updated: false, error: 'No result from classifier feedback' });
+      }
+    });
+  });
+}
+
 module.exports = {
   runSpamClassifier,
-  runDisasterClassifier
+  runDisasterClassifier,
+  runComplaintPipeline,
+  submitClassifierFeedback
 };